@@ -1,7 +1,12 @@
+import importlib
 import os
 import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
 
-from PySide6.QtCore import Qt, Signal, Slot
+from PySide6.QtCore import QSize, Qt, QTime, QTimer, Signal, Slot
 from PySide6.QtGui import QAction, QColor, QIcon, QPalette, QPixmap
 from PySide6.QtWidgets import (
     QApplication,
@@ -11,29 +16,51 @@ from PySide6.QtWidgets import (
     QGroupBox,
     QHBoxLayout,
     QLabel,
+    QLineEdit,
     QMainWindow,
     QMenu,
     QMessageBox,
+    QProgressBar,
     QPushButton,
     QDialog,
     QDialogButtonBox,
+    QSpinBox,
     QSystemTrayIcon,
     QTableWidget,
+    QTimeEdit,
     QVBoxLayout,
     QWidget,
 )
 
-from booking_config import load_preferences, load_schedule, save_preferences, save_schedule
-from booking_scheduler import BookingScheduler
+from booking_config import (
+    ENGINE_NAMES,
+    PRE_FIRE_MS_RANGE,
+    WARMUP_S_RANGE,
+    load_preferences,
+    load_schedule,
+    parse_time_of_day,
+    save_preferences,
+    save_schedule,
+)
+from booking_history import format_slot_stats
 
 
 ASSETS_DIR = os.path.join(os.path.dirname(__file__), "assets")
 SCHEDULE_DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-HOUR_VALUES = [f"{hour:02d}:00" for hour in range(24)]
+TIME_DISPLAY_FORMAT = "HH:mm:ss.zzz"
+HISTORY_WEEKS = 8
+ENGINE_DEFAULT_LABEL = "Default"
+# Background renders are cached per size bucket so resizing back and forth reuses earlier work
+BACKGROUND_BUCKET_PX = 64
+BACKGROUND_CACHE_SIZE = 8
+BACKGROUND_DEBOUNCE_MS = 60
 
 
 class MainWindow(QMainWindow):
     booking_completed = Signal(str, str)
+    scheduler_loaded = Signal(object)
+    scheduler_load_failed = Signal(str)
+    telemetry_received = Signal(dict)
 
     def __init__(self) -> None:
         super().__init__()
@@ -41,12 +68,55 @@ class MainWindow(QMainWindow):
         self.setMinimumSize(860, 540)
 
         self.booking_completed.connect(self._handle_booking_complete)
-        self.scheduler = BookingScheduler(self.booking_completed.emit)
+        self.scheduler_loaded.connect(self._handle_scheduler_loaded)
+        self.scheduler_load_failed.connect(self._handle_scheduler_load_failed)
+        self.telemetry_received.connect(self._handle_telemetry)
+        # Selenium and webdriver_manager are imported in the background once the window is up
+        self.scheduler = None
+        self._scheduler_error: str | None = None
+
+        self._background_cache: OrderedDict[tuple[int, int], QPixmap] = OrderedDict()
+        self._background_timer = QTimer(self)
+        self._background_timer.setSingleShot(True)
+        self._background_timer.setInterval(BACKGROUND_DEBOUNCE_MS)
+        self._background_timer.timeout.connect(self._update_background_pixmap)
+
+        # Only repaints the countdown from the last published fire time, the scheduler is never polled
+        self._next_fire_at: float | None = None
+        self._countdown_timer = QTimer(self)
+        self._countdown_timer.setInterval(200)
+        self._countdown_timer.timeout.connect(self._update_countdown)
 
         self._init_ui()
         self._init_tray()
         self._update_ui()
 
+    def start_scheduler_loader(self) -> None:
+        if self.scheduler is not None:
+            return
+        loader = threading.Thread(target=self._load_scheduler_module, daemon=True)
+        loader.start()
+
+    def _load_scheduler_module(self) -> None:
+        try:
+            module = importlib.import_module("booking_scheduler")
+        except Exception as exc:
+            self.scheduler_load_failed.emit(str(exc))
+            return
+        self.scheduler_loaded.emit(module)
+
+    @Slot(object)
+    def _handle_scheduler_loaded(self, module) -> None:
+        self.scheduler = module.BookingScheduler(self.booking_completed.emit)
+        # Signal emission queues the event onto the GUI thread, so the publisher never blocks on Qt
+        self.scheduler.events.subscribe(self.telemetry_received.emit)
+        self._update_ui()
+
+    @Slot(str)
+    def _handle_scheduler_load_failed(self, message: str) -> None:
+        self._scheduler_error = message
+        self._update_ui()
+
     def _init_ui(self) -> None:
         central = QWidget()
         central.setObjectName("central")
@@ -97,6 +167,11 @@ class MainWindow(QMainWindow):
         )
         self.start_stop_button.clicked.connect(self._toggle_booking)
 
+        self.rehearse_button = QPushButton("Rehearse selected slot")
+        self.rehearse_button.setFixedWidth(200)
+        self.rehearse_button.setToolTip("Run the full booking flow now, stopping right before the final book click")
+        self.rehearse_button.clicked.connect(self._rehearse_selected)
+
         self.status_label = QLabel("Scheduler stopped")
         self.status_label.setStyleSheet("color: #ffffff; font-size: 14px;")
         self.status_label.setAlignment(Qt.AlignCenter)
@@ -108,8 +183,10 @@ class MainWindow(QMainWindow):
         )
         schedule_layout = QVBoxLayout(schedule_group)
 
-        self.schedule_table = QTableWidget(0, 3)
-        self.schedule_table.setHorizontalHeaderLabels(["Day", "Check time", "Book time"])
+        self.schedule_table = QTableWidget(0, 7)
+        self.schedule_table.setHorizontalHeaderLabels(
+            ["Day", "Check time", "Book time", "Pre-fire", "Warm-up", "Rehearsal", "Engine"]
+        )
         self.schedule_table.verticalHeader().setVisible(False)
         self.schedule_table.setSelectionBehavior(QTableWidget.SelectRows)
         self.schedule_table.setStyleSheet(
@@ -131,9 +208,47 @@ class MainWindow(QMainWindow):
         schedule_layout.addWidget(self.schedule_table)
         schedule_layout.addLayout(schedule_button_row)
 
+        telemetry_group = QGroupBox("Live telemetry")
+        telemetry_group.setStyleSheet(
+            "QGroupBox { color: #ffffff; font-size: 16px; font-weight: 600; }"
+            "QGroupBox::title { subcontrol-origin: margin; subcontrol-position: top center; }"
+            "QLabel { color: #ffffff; font-size: 13px; font-weight: 400; }"
+        )
+        telemetry_layout = QGridLayout(telemetry_group)
+        self.next_fire_label = QLabel("-")
+        self.countdown_label = QLabel("-")
+        self.warmup_bar = QProgressBar()
+        self.warmup_bar.setRange(0, 100)
+        self.warmup_bar.setValue(0)
+        self.warmup_bar.setFormat("Idle")
+        self.clock_offset_label = QLabel("-")
+        self.phases_label = QLabel("-")
+        self.phases_label.setAlignment(Qt.AlignLeft | Qt.AlignTop)
+        self.outcome_label = QLabel("-")
+        self.history_label = QLabel("-")
+        self.history_label.setWordWrap(True)
+        telemetry_rows = [
+            ("Next fire", self.next_fire_label),
+            ("Countdown", self.countdown_label),
+            ("Warm-up", self.warmup_bar),
+            ("Clock offset", self.clock_offset_label),
+            ("Phases", self.phases_label),
+            ("Outcome", self.outcome_label),
+            ("History", self.history_label),
+        ]
+        for row, (name, widget) in enumerate(telemetry_rows):
+            telemetry_layout.addWidget(QLabel(name), row, 0, alignment=Qt.AlignLeft | Qt.AlignTop)
+            telemetry_layout.addWidget(widget, row, 1)
+        telemetry_layout.setColumnStretch(1, 1)
+
+        bottom_layout = QHBoxLayout()
+        bottom_layout.addWidget(schedule_group, stretch=3)
+        bottom_layout.addWidget(telemetry_group, stretch=2)
+
         controls_layout = QVBoxLayout()
         controls_layout.addWidget(self.run_background_checkbox, alignment=Qt.AlignCenter)
         controls_layout.addWidget(self.start_stop_button, alignment=Qt.AlignCenter)
+        controls_layout.addWidget(self.rehearse_button, alignment=Qt.AlignCenter)
         controls_layout.addWidget(self.status_label, alignment=Qt.AlignCenter)
         controls_layout.setSpacing(12)
 
@@ -146,7 +261,7 @@ class MainWindow(QMainWindow):
         main_layout = QVBoxLayout(content_widget)
         main_layout.addWidget(title)
         main_layout.addLayout(content_layout)
-        main_layout.addWidget(schedule_group)
+        main_layout.addLayout(bottom_layout)
 
         overlay_layout = QGridLayout(central)
         overlay_layout.setContentsMargins(0, 0, 0, 0)
@@ -185,7 +300,21 @@ class MainWindow(QMainWindow):
             self.tray_icon.show()
 
     def _update_ui(self) -> None:
-        if self.scheduler.is_running():
+        self.start_stop_button.setEnabled(self.scheduler is not None)
+        self.start_stop_action.setEnabled(self.scheduler is not None)
+        self.rehearse_button.setEnabled(self.scheduler is not None)
+        if self.scheduler is not None and self.scheduler.is_rehearsing():
+            self.rehearse_button.setText("Stop rehearsal")
+        else:
+            self.rehearse_button.setText("Rehearse selected slot")
+        if self.scheduler is None:
+            self.start_stop_button.setText("Start booking")
+            self.start_stop_action.setText("Start booking")
+            if self._scheduler_error:
+                self.status_label.setText(f"Booking engine failed to load: {self._scheduler_error}")
+            else:
+                self.status_label.setText("Loading booking engine...")
+        elif self.scheduler.is_running():
             self.start_stop_button.setText("Stop booking")
             self.start_stop_action.setText("Stop booking")
             self.status_label.setText("Scheduler running")
@@ -195,6 +324,8 @@ class MainWindow(QMainWindow):
             self.status_label.setText("Scheduler stopped")
 
     def _toggle_booking(self) -> None:
+        if self.scheduler is None:
+            return
         if self.scheduler.is_running():
             self.scheduler.stop()
         else:
@@ -208,6 +339,26 @@ class MainWindow(QMainWindow):
                     self._hide_to_tray(show_message=True)
         self._update_ui()
 
+    def _rehearse_selected(self) -> None:
+        if self.scheduler is None:
+            return
+        if self.scheduler.is_rehearsing():
+            self.scheduler.stop_rehearsal()
+            return
+        selected_rows = sorted(index.row() for index in self.schedule_table.selectionModel().selectedRows())
+        row = selected_rows[0] if selected_rows else 0
+        day_combo = self.schedule_table.cellWidget(row, 0)
+        if not isinstance(day_combo, QComboBox):
+            QMessageBox.information(self, "USC Padel Booking", "Add a slot to rehearse first.")
+            return
+        try:
+            email, password = self._get_credentials()
+            engine = self._engine_value(self.schedule_table.cellWidget(row, 6))
+            self.scheduler.rehearse(day_combo.currentText(), email, password, engine=engine)
+        except ValueError as exc:
+            QMessageBox.warning(self, "Rehearsal not started", str(exc))
+        self._update_ui()
+
     def _get_credentials(self) -> tuple[str, str]:
         email = os.getenv("USC_EMAIL", "").strip()
         password = os.getenv("USC_PASSWORD", "").strip()
@@ -254,42 +405,39 @@ class MainWindow(QMainWindow):
         for slot in load_schedule():
             self._add_schedule_row(slot)
 
+    def _build_time_edit(self, slot: dict | None, key: str, default: str) -> QTimeEdit:
+        time_edit = QTimeEdit()
+        time_edit.setDisplayFormat(TIME_DISPLAY_FORMAT)
+        saved_value = slot.get(key) if slot else None
+        parsed = parse_time_of_day(saved_value) if isinstance(saved_value, str) else None
+        if parsed is None:
+            parsed = parse_time_of_day(default)
+        time_edit.setTime(QTime(parsed.hour, parsed.minute, parsed.second, parsed.microsecond // 1000))
+        time_edit.setToolTip("Time of day with milliseconds (HH:MM:SS.mmm)")
+        return time_edit
+
     @staticmethod
-    def _format_hour_display(value: str | None) -> str | None:
-        if not value:
-            return None
-        cleaned = value.strip()
-        if cleaned.count(":") == 2:
-            hour, minute, second = cleaned.split(":")
-            if minute == "00" and second == "00" and hour.isdigit():
-                hour_value = int(hour)
-                if 0 <= hour_value <= 23:
-                    return f"{hour_value:02d}:00"
-        if cleaned.count(":") == 1:
-            hour, minute = cleaned.split(":")
-            if minute == "00" and hour.isdigit():
-                hour_value = int(hour)
-                if 0 <= hour_value <= 23:
-                    return f"{hour_value:02d}:00"
-        return None
-
-    def _format_hour_for_save(self, value: str) -> str | None:
-        display_value = self._format_hour_display(value)
-        if display_value is None:
+    def _build_offset_spin(value: float | None, bounds: tuple[float, float], suffix: str, tooltip: str) -> QSpinBox:
+        # The value just below the valid range shows "Auto" and leaves the offset to the adaptive plan
+        spin = QSpinBox()
+        spin.setRange(int(bounds[0]) - 1, int(bounds[1]))
+        spin.setSpecialValueText("Auto")
+        spin.setSuffix(suffix)
+        spin.setToolTip(tooltip)
+        spin.setValue(spin.minimum() if value is None else int(round(value)))
+        return spin
+
+    @staticmethod
+    def _offset_value(spin: QWidget | None) -> int | None:
+        if not isinstance(spin, QSpinBox) or spin.value() == spin.minimum():
             return None
-        return f"{display_value}:00"
+        return spin.value()
 
-    def _build_time_combo(self, slot: dict | None, key: str, default: str) -> QComboBox:
-        time_combo = QComboBox()
-        time_combo.addItems(HOUR_VALUES)
-        saved_value = slot.get(key) if slot else None
-        display_value = self._format_hour_display(saved_value)
-        if display_value in HOUR_VALUES:
-            time_combo.setCurrentText(display_value)
-        elif default in HOUR_VALUES:
-            time_combo.setCurrentText(default)
-        time_combo.setToolTip("Select an hour (HH:00)")
-        return time_combo
+    @staticmethod
+    def _engine_value(combo: QWidget | None) -> str | None:
+        if not isinstance(combo, QComboBox) or combo.currentText() not in ENGINE_NAMES:
+            return None
+        return combo.currentText()
 
     def _add_schedule_row(self, slot: dict | None = None) -> None:
         row = self.schedule_table.rowCount()
@@ -302,11 +450,41 @@ class MainWindow(QMainWindow):
             day_combo.setCurrentText(day_value)
         self.schedule_table.setCellWidget(row, 0, day_combo)
 
-        check_time_combo = self._build_time_combo(slot, "check_time", "19:00")
-        self.schedule_table.setCellWidget(row, 1, check_time_combo)
+        check_time_edit = self._build_time_edit(slot, "check_time", "19:00")
+        self.schedule_table.setCellWidget(row, 1, check_time_edit)
 
-        book_time_combo = self._build_time_combo(slot, "book_time", "20:00")
-        self.schedule_table.setCellWidget(row, 2, book_time_combo)
+        book_time_edit = self._build_time_edit(slot, "book_time", "20:00")
+        self.schedule_table.setCellWidget(row, 2, book_time_edit)
+
+        pre_fire_spin = self._build_offset_spin(
+            slot.get("pre_fire_ms") if slot else None,
+            PRE_FIRE_MS_RANGE,
+            " ms",
+            "Fire this many milliseconds before the book time (Auto uses the learned offset)",
+        )
+        self.schedule_table.setCellWidget(row, 3, pre_fire_spin)
+
+        warmup_spin = self._build_offset_spin(
+            slot.get("warmup_s") if slot else None,
+            WARMUP_S_RANGE,
+            " s",
+            "Start the browser warm-up this many seconds before the book time (Auto uses the learned lead)",
+        )
+        self.schedule_table.setCellWidget(row, 4, warmup_spin)
+
+        rehearsal_checkbox = QCheckBox()
+        rehearsal_checkbox.setChecked(bool(slot.get("rehearsal")) if slot else False)
+        rehearsal_checkbox.setToolTip("Run this slot as a rehearsal that stops before the final book click")
+        self.schedule_table.setCellWidget(row, 5, rehearsal_checkbox)
+
+        engine_combo = QComboBox()
+        engine_combo.addItem(ENGINE_DEFAULT_LABEL)
+        engine_combo.addItems(ENGINE_NAMES)
+        engine_value = slot.get("engine") if slot else None
+        if engine_value in ENGINE_NAMES:
+            engine_combo.setCurrentText(engine_value)
+        engine_combo.setToolTip("Browser engine for this slot (Default uses the engine preference)")
+        self.schedule_table.setCellWidget(row, 6, engine_combo)
 
     def _remove_schedule_rows(self) -> None:
         selected_rows = {index.row() for index in self.schedule_table.selectionModel().selectedRows()}
@@ -314,21 +492,36 @@ class MainWindow(QMainWindow):
             self.schedule_table.removeRow(row)
 
     def _save_schedule(self) -> None:
-        slots: list[dict[str, str]] = []
+        slots: list[dict] = []
         for row in range(self.schedule_table.rowCount()):
             day_combo = self.schedule_table.cellWidget(row, 0)
-            check_time_combo = self.schedule_table.cellWidget(row, 1)
-            book_time_combo = self.schedule_table.cellWidget(row, 2)
+            check_time_edit = self.schedule_table.cellWidget(row, 1)
+            book_time_edit = self.schedule_table.cellWidget(row, 2)
+            rehearsal_checkbox = self.schedule_table.cellWidget(row, 5)
             if not isinstance(day_combo, QComboBox):
                 continue
-            if not isinstance(check_time_combo, QComboBox) or not isinstance(book_time_combo, QComboBox):
+            if not isinstance(check_time_edit, QTimeEdit) or not isinstance(book_time_edit, QTimeEdit):
                 continue
             day = day_combo.currentText().strip()
-            check_time = self._format_hour_for_save(check_time_combo.currentText())
-            book_time = self._format_hour_for_save(book_time_combo.currentText())
-            if not day or not check_time or not book_time:
+            if not day:
                 continue
-            slots.append({"day": day, "check_time": check_time, "book_time": book_time})
+            slot = {
+                "day": day,
+                "check_time": check_time_edit.time().toString(TIME_DISPLAY_FORMAT),
+                "book_time": book_time_edit.time().toString(TIME_DISPLAY_FORMAT),
+            }
+            pre_fire_ms = self._offset_value(self.schedule_table.cellWidget(row, 3))
+            if pre_fire_ms is not None:
+                slot["pre_fire_ms"] = pre_fire_ms
+            warmup_s = self._offset_value(self.schedule_table.cellWidget(row, 4))
+            if warmup_s is not None:
+                slot["warmup_s"] = warmup_s
+            if isinstance(rehearsal_checkbox, QCheckBox) and rehearsal_checkbox.isChecked():
+                slot["rehearsal"] = True
+            engine = self._engine_value(self.schedule_table.cellWidget(row, 6))
+            if engine is not None:
+                slot["engine"] = engine
+            slots.append(slot)
         if not slots:
             slots = load_schedule()
         save_schedule(slots)
@@ -352,7 +545,8 @@ class MainWindow(QMainWindow):
         self.activateWindow()
 
     def _quit_app(self) -> None:
-        self.scheduler.stop()
+        if self.scheduler is not None:
+            self.scheduler.stop()
         QApplication.quit()
 
     def _on_tray_activated(self, reason: QSystemTrayIcon.ActivationReason) -> None:
@@ -364,21 +558,48 @@ class MainWindow(QMainWindow):
 
     def resizeEvent(self, event) -> None:
         super().resizeEvent(event)
-        self._update_background_pixmap()
+        # Reuse a cached render straight away, otherwise keep the stale one until resizing settles
+        if not self._apply_cached_background():
+            self._background_timer.start()
 
     def _asset_path(self, filename: str) -> str:
         return os.path.abspath(os.path.join(ASSETS_DIR, filename))
 
+    @staticmethod
+    def _background_bucket(size: QSize) -> tuple[int, int]:
+        width = -(-max(size.width(), 1) // BACKGROUND_BUCKET_PX) * BACKGROUND_BUCKET_PX
+        height = -(-max(size.height(), 1) // BACKGROUND_BUCKET_PX) * BACKGROUND_BUCKET_PX
+        return width, height
+
+    def _apply_cached_background(self) -> bool:
+        if self._background_pixmap.isNull():
+            return False
+        target_size = self.centralWidget().size()
+        bucket = self._background_bucket(target_size)
+        scaled = self._background_cache.get(bucket)
+        if scaled is None:
+            return False
+        self._background_cache.move_to_end(bucket)
+        self.background_label.setPixmap(scaled)
+        self.background_label.setMinimumSize(target_size)
+        return True
+
     def _update_background_pixmap(self) -> None:
         if self._background_pixmap.isNull():
             self.background_label.clear()
             return
+        if self._apply_cached_background():
+            return
         target_size = self.centralWidget().size()
+        bucket = self._background_bucket(target_size)
         scaled = self._background_pixmap.scaled(
-            target_size,
+            QSize(*bucket),
             Qt.KeepAspectRatioByExpanding,
             Qt.SmoothTransformation,
         )
+        self._background_cache[bucket] = scaled
+        while len(self._background_cache) > BACKGROUND_CACHE_SIZE:
+            self._background_cache.popitem(last=False)
         self.background_label.setPixmap(scaled)
         self.background_label.setMinimumSize(target_size)
 
@@ -387,9 +608,75 @@ class MainWindow(QMainWindow):
             event.ignore()
             self._hide_to_tray(show_message=True)
             return
-        self.scheduler.stop()
+        if self.scheduler is not None:
+            self.scheduler.stop()
         event.accept()
 
+    @Slot(dict)
+    def _handle_telemetry(self, event: dict) -> None:
+        kind = event.get("kind")
+        if kind == "next_fire":
+            self._next_fire_at = event.get("fire_at")
+            if self._next_fire_at is None:
+                self.next_fire_label.setText("-")
+                self.countdown_label.setText("-")
+                self._countdown_timer.stop()
+            else:
+                fire_at = datetime.fromtimestamp(self._next_fire_at)
+                self.next_fire_label.setText(f"{event.get('day')} slot, {fire_at:%a %d-%m %H:%M:%S}")
+                self._update_history(event.get("day"), event.get("target_time"))
+                self._update_countdown()
+                self._countdown_timer.start()
+        elif kind == "rehearsal":
+            self._update_ui()
+        elif kind == "scheduler" and not event.get("running"):
+            self._next_fire_at = None
+            self._countdown_timer.stop()
+            self.next_fire_label.setText("-")
+            self.countdown_label.setText("-")
+        elif kind == "warmup":
+            if event.get("stage") == "launch":
+                self.phases_label.setText("-")
+                self.outcome_label.setText("Running")
+            self.warmup_bar.setValue(round(event.get("progress", 0) * 100))
+            self.warmup_bar.setFormat(str(event.get("stage", "")).capitalize())
+        elif kind == "clock_offset":
+            offset_ms = event.get("offset_ms")
+            self.clock_offset_label.setText("unknown" if offset_ms is None else f"{offset_ms:+.0f} ms vs site")
+        elif kind == "phase":
+            line = f"{event.get('name')}: {event.get('duration_ms', 0):.0f} ms"
+            current = self.phases_label.text()
+            self.phases_label.setText(line if current == "-" else f"{current}\n{line}")
+        elif kind == "outcome":
+            outcome = f"{event.get('status')} in {event.get('total_ms', 0) / 1000:.1f} s"
+            if event.get("rehearsal") and event.get("status") != "rehearsal":
+                outcome = f"rehearsal {outcome}"
+            if event.get("error"):
+                outcome = f"{outcome} ({event['error']})"
+            if event.get("booked_by"):
+                abort = "?" if event.get("abort_ms") is None else f"{event['abort_ms']:.0f}"
+                outcome = f"{outcome}, {event['booked_by']} booked, stopped after {abort} ms"
+            self.outcome_label.setText(outcome)
+            self.warmup_bar.setValue(0)
+            self.warmup_bar.setFormat("Idle")
+
+    def _update_history(self, day: str | None, slot_time: str | None) -> None:
+        if self.scheduler is None or not day or not slot_time:
+            self.history_label.setText("-")
+            return
+        stats = self.scheduler.history.slot_stats(day, slot_time, HISTORY_WEEKS)
+        self.history_label.setText(format_slot_stats(stats))
+
+    def _update_countdown(self) -> None:
+        if self._next_fire_at is None:
+            return
+        remaining = max(self._next_fire_at - time.time(), 0.0)
+        hours, rest = divmod(int(remaining), 3600)
+        minutes, seconds = divmod(rest, 60)
+        days, hours = divmod(hours, 24)
+        prefix = f"{days}d " if days else ""
+        self.countdown_label.setText(f"{prefix}{hours:02d}:{minutes:02d}:{seconds:02d}")
+
     @Slot(str, str)
     def _handle_booking_complete(self, day: str, book_time: str) -> None:
         message = f"Booked {day} slot at {book_time}."
@@ -411,6 +698,7 @@ def main() -> None:
     window.show()  # CHANGED
     window.raise_()  # CHANGED
     window.activateWindow()  # CHANGED
+    QTimer.singleShot(0, window.start_scheduler_loader)
     sys.exit(app.exec())  # CHANGED
 
 
@@ -0,0 +1,79 @@
+import argparse
+import statistics
+import threading
+import time
+
+from booking_adaptive import FIRE_PHASES, sample_from_outcome
+from booking_config import ENGINE_NAMES
+from booking_engines import create_session
+from booking_scheduler import fill_form
+from mock_site import MockSite
+
+BENCH_CREDENTIALS = ("bench@example.com", "bench")
+
+
+def measure_round_trips(engine: str, login_url: str, calls: int) -> list[float]:
+    # Bare command latency: one trivial script per call, no page work
+    session = create_session(engine)
+    try:
+        session.open(login_url)
+        samples = []
+        for _ in range(calls):
+            start = time.perf_counter()
+            session.execute("return 1" if engine == "selenium" else "1")
+            samples.append((time.perf_counter() - start) * 1000)
+        return samples
+    finally:
+        session.quit()
+
+
+def measure_booking(engine: str, site: MockSite) -> dict:
+    site.reset()
+    return fill_form(
+        None,
+        threading.Event(),
+        "Monday",
+        credentials=BENCH_CREDENTIALS,
+        profile_wire=True,
+        engine=engine,
+        login_url=site.login_url,
+    )
+
+
+def format_ms(values: list[float]) -> str:
+    if not values:
+        return "no samples"
+    return f"median {statistics.median(values):.1f} ms, min {min(values):.1f} ms, max {max(values):.1f} ms"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the Selenium and DevTools engines on the local mock site.")
+    parser.add_argument("--runs", type=int, default=3, help="Full booking runs per engine.")
+    parser.add_argument("--calls", type=int, default=200, help="Bare round trips per engine.")
+    parser.add_argument("--engine", choices=ENGINE_NAMES, action="append", help="Only benchmark these engines.")
+    args = parser.parse_args()
+
+    site = MockSite().start()
+    try:
+        for engine in args.engine or ENGINE_NAMES:
+            trips = measure_round_trips(engine, site.login_url, args.calls)
+            print(f"{engine}: command round trip {format_ms(trips)}")
+            fire_to_book = []
+            fire_trips = []
+            for _ in range(args.runs):
+                outcome = measure_booking(engine, site)
+                if outcome["status"] != "booked":
+                    print(f"{engine}: run ended {outcome['status']} {outcome.get('error') or ''}")
+                    continue
+                fire_to_book.append(sample_from_outcome(outcome)["fire_to_book_ms"])
+                round_trips = outcome.get("round_trips", {})
+                fire_trips.append(sum(round_trips.get(phase, 0) for phase in FIRE_PHASES))
+            print(f"{engine}: fire to book {format_ms(fire_to_book)}")
+            if fire_trips:
+                print(f"{engine}: {statistics.median(fire_trips):.0f} round trips after the fire instant")
+    finally:
+        site.stop()
+
+
+if __name__ == "__main__":
+    main()
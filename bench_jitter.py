@@ -0,0 +1,71 @@
+import argparse
+import statistics
+import threading
+import time
+
+from booking_adaptive import percentile
+from booking_scheduler import wait_until
+from booking_worker import BookingWorker
+
+
+def busy_load(stop: threading.Event) -> None:
+    # Pure Python work holds the GIL, like Qt slots and telemetry handlers do in the GUI process
+    while not stop.is_set():
+        sum(index * index for index in range(20000))
+
+
+def fire_in_thread(fire_at: float) -> float:
+    result: list[float] = []
+
+    def fire() -> None:
+        wait_until(fire_at, threading.Event())
+        result.append((time.time() - fire_at) * 1000)
+
+    worker = threading.Thread(target=fire, daemon=True)
+    worker.start()
+    worker.join()
+    return result[0]
+
+
+def measure(fire, fires: int, spacing_s: float) -> list[float]:
+    samples = []
+    for _ in range(fires):
+        samples.append(fire(time.time() + spacing_s))
+    return samples
+
+
+def format_ms(values: list[float]) -> str:
+    ordered = sorted(values)
+    p95 = percentile(ordered, 0.95)
+    return f"median {statistics.median(ordered):.3f} ms, p95 {p95:.3f} ms, max {ordered[-1]:.3f} ms"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare fire-instant jitter in a thread versus the isolated worker.")
+    parser.add_argument("--fires", type=int, default=50)
+    parser.add_argument("--spacing", type=float, default=0.2, help="Seconds between fire instants.")
+    parser.add_argument("--load", type=int, default=2, help="Busy threads in this process while firing.")
+    parser.add_argument("--cpus", help="Comma separated CPUs to pin the worker to.")
+    parser.add_argument("--priority", type=int, default=0, help="Priority raise for the worker when permitted.")
+    args = parser.parse_args()
+
+    cpus = [int(value) for value in args.cpus.split(",")] if args.cpus else None
+    worker = BookingWorker(cpus=cpus, priority=args.priority)
+    worker.start()
+    print(f"Worker isolation: {worker.info}")
+
+    stop = threading.Event()
+    for _ in range(args.load):
+        threading.Thread(target=busy_load, args=(stop,), daemon=True).start()
+    try:
+        in_thread = measure(fire_in_thread, args.fires, args.spacing)
+        in_process = measure(lambda fire_at: worker.probe(fire_at)["fire_error_ms"], args.fires, args.spacing)
+    finally:
+        stop.set()
+        worker.close()
+    print(f"Fire error in thread ({args.load} busy threads): {format_ms(in_thread)}")
+    print(f"Fire error in isolated worker: {format_ms(in_process)}")
+
+
+if __name__ == "__main__":
+    main()
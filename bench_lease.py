@@ -0,0 +1,88 @@
+import argparse
+import multiprocessing
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+
+from booking_adaptive import percentile
+from booking_lease import LeaseStore, SlotLease, lease_key
+
+
+def run_agent(path: str, key: str, name: str, start_at: float, fail_rate: float, results) -> None:
+    # Stand-in for one booking agent: race to the book button, claim, click, confirm or give the slot up
+    store = LeaseStore(path)
+    lease = SlotLease(store, key, name)
+    abort_event = lease.watch(threading.Event())
+    while time.time() < start_at:
+        time.sleep(0.001)
+    lease.arm()
+    result = {"agent": name, "status": "yielded"}
+    # Time from the fire instant to the book button differs per agent
+    if not abort_event.wait(random.uniform(0.05, 0.15)):
+        if lease.claim():
+            time.sleep(random.uniform(0.02, 0.08))
+            if random.random() < fail_rate:
+                lease.release()
+                result["status"] = "released"
+            else:
+                lease.confirm()
+                result["status"] = "booked"
+    lease.close()
+    result.update(lease.metrics)
+    results.put(result)
+
+
+def run_round(path: str, round_index: int, agents: int, fail_rate: float) -> list[dict]:
+    key = lease_key("Bench", f"round-{round_index}", "-")
+    results = multiprocessing.Queue()
+    start_at = time.time() + 0.5
+    processes = [
+        multiprocessing.Process(target=run_agent, args=(path, key, f"agent-{index}", start_at, fail_rate, results))
+        for index in range(agents)
+    ]
+    for process in processes:
+        process.start()
+    collected = [results.get(timeout=30) for _ in processes]
+    for process in processes:
+        process.join()
+    return collected
+
+
+def format_ms(values: list[float]) -> str:
+    if not values:
+        return "no samples"
+    ordered = sorted(values)
+    p95 = percentile(ordered, 0.95)
+    return f"median {statistics.median(ordered):.2f} ms, p95 {p95:.2f} ms, max {ordered[-1]:.2f} ms"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Race several local agent processes for one slot through the lease.")
+    parser.add_argument("--agents", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--fail-rate", type=float, default=0.2, help="Chance a lease holder fails to confirm.")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="usc-lease-")
+    path = os.path.join(directory, "leases.sqlite3")
+    claims = []
+    aborts = []
+    double_bookings = 0
+    unbooked = 0
+    for round_index in range(args.rounds):
+        results = run_round(path, round_index, args.agents, args.fail_rate)
+        booked = sum(1 for result in results if result["status"] == "booked")
+        double_bookings += booked > 1
+        unbooked += booked == 0
+        claims.extend(result["claim_ms"] for result in results if "claim_ms" in result)
+        aborts.extend(result["abort_signal_ms"] for result in results if result.get("abort_signal_ms") is not None)
+    print(f"{args.rounds} rounds with {args.agents} agents: {double_bookings} double bookings, {unbooked} unbooked")
+    print(f"Claim latency: {format_ms(claims)}")
+    print(f"Abort latency after the winning confirm: {format_ms(aborts)}")
+
+
+if __name__ == "__main__":
+    main()
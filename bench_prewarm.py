@@ -0,0 +1,62 @@
+import argparse
+import statistics
+import threading
+import time
+from datetime import datetime
+
+from booking_adaptive import sample_from_outcome
+from booking_config import ENGINE_NAMES, format_time_of_day
+from booking_scheduler import fill_form
+from mock_site import MockSite
+
+BENCH_CREDENTIALS = ("bench@example.com", "bench")
+
+
+def run_once(site: MockSite, engine: str, prewarm: bool, lead_s: float) -> dict:
+    # Rehearse against an opening lead_s from now so warm-up, keep-alive and the fire all happen
+    opens_at = time.time() + lead_s
+    site.reset(opens_at=opens_at)
+    return fill_form(
+        format_time_of_day(datetime.fromtimestamp(opens_at).time()),
+        threading.Event(),
+        "Monday",
+        rehearsal=True,
+        credentials=BENCH_CREDENTIALS,
+        engine=engine,
+        login_url=site.login_url,
+        prewarm=prewarm,
+    )
+
+
+def median_of(rows: list[dict], key: str) -> str:
+    values = [row[key] for row in rows if row.get(key) is not None]
+    return f"{statistics.median(values):.0f}" if values else "-"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the fire-time reload after warm-up versus cold.")
+    parser.add_argument("--engine", choices=ENGINE_NAMES, action="append", help="Only benchmark these engines.")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--lead", type=float, default=20.0, help="Seconds between the start and the fire.")
+    args = parser.parse_args()
+
+    site = MockSite().start()
+    try:
+        for engine in args.engine or ENGINE_NAMES:
+            for prewarm in (False, True):
+                outcomes = [run_once(site, engine, prewarm, args.lead) for _ in range(args.runs)]
+                samples = [sample_from_outcome(outcome) for outcome in outcomes]
+                label = "warm" if prewarm else "cold"
+                print(
+                    f"{engine:<9} {label}: reload {median_of(outcomes, 'reload_requests')} requests, "
+                    f"{median_of(outcomes, 'reload_bytes')} bytes, {median_of(outcomes, 'reload_cached')} from cache, "
+                    f"{median_of(outcomes, 'reload_opaque')} opaque; "
+                    f"refresh {median_of(samples, 'refresh_ms')} ms, "
+                    f"fire to book button {median_of(samples, 'fire_to_book_ms')} ms"
+                )
+    finally:
+        site.stop()
+
+
+if __name__ == "__main__":
+    main()
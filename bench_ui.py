@@ -0,0 +1,119 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QSize, Qt
+from PySide6.QtWidgets import QApplication, QMainWindow
+
+# Child process: time from interpreter start until the window has been shown and painted once
+STARTUP_SNIPPET = """
+import time
+start = time.perf_counter()
+import sys
+if {eager}:
+    import booking_scheduler
+from PySide6.QtWidgets import QApplication
+import app_ui
+app = QApplication(sys.argv)
+window = app_ui.MainWindow()
+window.show()
+app.processEvents()
+print(time.perf_counter() - start)
+"""
+
+
+def measure_startup(eager: bool, runs: int) -> list[float]:
+    samples: list[float] = []
+    snippet = STARTUP_SNIPPET.format(eager=eager)
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", snippet],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        samples.append(float(result.stdout.strip().splitlines()[-1]))
+    return samples
+
+
+def drag_sizes(steps: int) -> list[QSize]:
+    sizes = [QSize(860 + step * 6, 540 + step * 4) for step in range(steps)]
+    # Drag out and back in, which is where the size bucket cache pays off
+    return sizes + list(reversed(sizes))
+
+
+def legacy_window_class():
+    import app_ui
+
+    class LegacyResizeWindow(app_ui.MainWindow):
+        # The old behaviour: a smooth rescale of the background on every resize event
+        def resizeEvent(self, event) -> None:
+            QMainWindow.resizeEvent(self, event)
+            target_size = self.centralWidget().size()
+            self.background_label.setPixmap(
+                self._background_pixmap.scaled(target_size, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
+            )
+            self.background_label.setMinimumSize(target_size)
+
+    return LegacyResizeWindow
+
+
+def measure_resize(window, sizes: list[QSize]) -> float:
+    # Both variants go through the same window.resize + event processing path, layout pass included
+    window.resize(sizes[-1])
+    QApplication.processEvents()
+    window._background_cache.clear()
+    start = time.perf_counter()
+    for size in sizes:
+        window.resize(size)
+        QApplication.processEvents()
+    # Let a pending debounced render settle so its cost is included
+    if window._background_timer.isActive():
+        window._background_timer.stop()
+        window._update_background_pixmap()
+    return time.perf_counter() - start
+
+
+def format_ms(values: list[float]) -> str:
+    return f"median {statistics.median(values) * 1000:.1f} ms, min {min(values) * 1000:.1f} ms"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark GUI cold start and background resize cost.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--steps", type=int, default=120)
+    args = parser.parse_args()
+
+    eager = measure_startup(True, args.runs)
+    lazy = measure_startup(False, args.runs)
+    print(f"Startup, eager scheduler import: {format_ms(eager)}")
+    print(f"Startup, background scheduler import: {format_ms(lazy)}")
+
+    import app_ui
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    legacy = legacy_window_class()()
+    current = app_ui.MainWindow()
+    for window in (legacy, current):
+        window.show()
+    app.processEvents()
+    if current._background_pixmap.isNull():
+        print("Background asset missing, skipping resize benchmark")
+        return
+
+    sizes = drag_sizes(args.steps)
+    uncached = [measure_resize(legacy, sizes) for _ in range(args.runs)]
+    cached = [measure_resize(current, sizes) for _ in range(args.runs)]
+    print(f"Resize ({len(sizes)} events), smooth rescale per event: {format_ms(uncached)}")
+    print(f"Resize ({len(sizes)} events), debounced + bucket cache: {format_ms(cached)}")
+
+
+if __name__ == "__main__":
+    main()
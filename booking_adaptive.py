@@ -0,0 +1,106 @@
+import statistics
+import time
+from typing import Any, Dict, List
+PREPARE_PHASES = ("launch", "login", "filter", "clock", "prewarm")
+# The lease claim is left out: waiting for another agent is not page latency, and claim_ms records it apart
+FIRE_PHASES = ("refresh", "select_day", "select_slot", "modal", "guests", "book")
+# Share of the refresh round trip spent before the site starts handling the request
+REQUEST_SHARE = 0.5
+WARMUP_SAFETY_FACTOR = 1.5
+WARMUP_MARGIN_S = 15
+RECENT_SAMPLES = 10
+
+
+def sample_from_outcome(outcome: Dict[str, Any]) -> Dict[str, Any]:
+    durations = {phase["name"]: phase["duration_ms"] for phase in outcome.get("phases", [])}
+    sample: Dict[str, Any] = {
+        "recorded_at": time.time(),
+        "status": outcome.get("status"),
+        "rehearsal": bool(outcome.get("rehearsal")),
+        "fire_offset_ms": outcome.get("fire_offset_ms"),
+        "prepare_ms": sum(durations.get(name, 0.0) for name in PREPARE_PHASES),
+        "fire_to_book_ms": sum(durations.get(name, 0.0) for name in FIRE_PHASES),
+        "last_phase": outcome["phases"][-1]["name"] if outcome.get("phases") else None,
+        "site_arrival_ms": outcome.get("site_arrival_ms"),
+    }
+    if "refresh" in durations:
+        sample["refresh_ms"] = durations["refresh"]
+    return sample
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _clamp(value: float, lower: float, upper: float) -> float:
+    return max(lower, min(upper, value))
+
+
+def _outcome_adjustment(sample: Dict[str, Any], step_ms: float) -> tuple[float, str]:
+    status = sample.get("status")
+    offset = sample.get("fire_offset_ms") or 0
+    if status == "booked":
+        return 0.0, "last run booked, keeping offset"
+    if status == "no_slots":
+        # No slots listed means either the request beat the opening or everything was already taken;
+        # the site-clock arrival time of the slot list request tells the two apart
+        arrival = sample.get("site_arrival_ms")
+        if arrival is None:
+            return 0.0, "last run found no slots, arrival time unknown"
+        if arrival < 0:
+            return (-step_ms if offset > 0 else 0.0), f"last run reached the site {-arrival:.0f} ms too early"
+        return step_ms, "last run found the slots already taken"
+    if status == "unconfirmed":
+        return step_ms, "last run's book click was beaten"
+    if status == "failed" and sample.get("last_phase") in ("select_slot", "modal", "guests", "book"):
+        return step_ms, "last run lost the slot"
+    return 0.0, "last run inconclusive"
+
+
+def compute_fire_plan(samples: List[Dict[str, Any]], preferences: Dict[str, Any]) -> Dict[str, Any]:
+    min_pre_fire = float(preferences.get("min_pre_fire_ms", 0))
+    max_pre_fire = float(preferences.get("max_pre_fire_ms", 400))
+    step = float(preferences.get("pre_fire_step_ms", 25))
+    min_warmup = float(preferences.get("min_warmup_s", 60))
+    max_warmup = float(preferences.get("max_warmup_s", 300))
+    recent = samples[-RECENT_SAMPLES:]
+
+    adaptive = preferences.get("adaptive_fire", True)
+    if not adaptive or not recent:
+        return {
+            "pre_fire_ms": _clamp(0.0, min_pre_fire, max_pre_fire),
+            "warmup_s": min_warmup,
+            "reason": "no history yet" if adaptive else "adaptive timing disabled",
+        }
+
+    refresh = [sample["refresh_ms"] for sample in recent if sample.get("refresh_ms")]
+    base = statistics.median(refresh) * REQUEST_SHARE if refresh else 0.0
+    real_runs = [sample for sample in recent if not sample.get("rehearsal") and sample.get("status") != "stopped"]
+    if real_runs and real_runs[-1].get("fire_offset_ms") is not None:
+        anchor = float(real_runs[-1]["fire_offset_ms"])
+        adjustment, reason = _outcome_adjustment(real_runs[-1], step)
+    else:
+        anchor, adjustment, reason = base, 0.0, "from measured refresh latency"
+    pre_fire = _clamp(anchor + adjustment, min_pre_fire, max_pre_fire)
+
+    prepare = [sample["prepare_ms"] for sample in recent if sample.get("prepare_ms")]
+    if prepare:
+        warmup = percentile(prepare, 0.95) / 1000 * WARMUP_SAFETY_FACTOR + WARMUP_MARGIN_S
+    else:
+        warmup = min_warmup
+    return {
+        "pre_fire_ms": round(pre_fire, 1),
+        "warmup_s": round(_clamp(warmup, min_warmup, max_warmup), 1),
+        "reason": f"{reason}, {len(recent)} samples",
+    }
+
+
+def load_fire_plan(history: Any, day: str, book_time: str, preferences: Dict[str, Any]) -> Dict[str, Any]:
+    # history is a BookingHistory; typed loosely because booking_history builds on this module
+    return compute_fire_plan(history.recent_samples(day, book_time, RECENT_SAMPLES), preferences)
+
+
+def format_fire_plan(plan: Dict[str, Any]) -> str:
+    return f"pre-fire {plan['pre_fire_ms']:.0f} ms, warm-up {plan['warmup_s']:.0f} s ({plan['reason']})"
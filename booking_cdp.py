@@ -0,0 +1,297 @@
+import base64
+import json
+import os
+import shutil
+import socket
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+CHROME_CANDIDATES = [
+    "google-chrome",
+    "google-chrome-stable",
+    "chromium",
+    "chromium-browser",
+    "chrome",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+    r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+    r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+]
+LAUNCH_TIMEOUT_S = 15
+CommandHook = Callable[[str, Optional[Dict[str, Any]], float], None]
+
+
+class CdpError(RuntimeError):
+    pass
+
+
+def find_chrome() -> str:
+    configured = os.environ.get("CHROME_PATH")
+    if configured:
+        return configured
+    for candidate in CHROME_CANDIDATES:
+        resolved = shutil.which(candidate) or (candidate if os.path.isfile(candidate) else None)
+        if resolved:
+            return resolved
+    raise CdpError("Chrome not found. Install Chrome or set CHROME_PATH.")
+
+
+class WebSocket:
+    # Minimal RFC 6455 client: text frames out, text/continuation/ping/close in
+    def __init__(self, url: str, timeout: float = 10.0) -> None:
+        parsed = urlparse(url)
+        self._sock = socket.create_connection((parsed.hostname, parsed.port or 80), timeout=timeout)
+        # Commands are tiny, so never let Nagle hold one back waiting for more data
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._send_lock = threading.Lock()
+        self._buffer = b""
+        key = base64.b64encode(os.urandom(16)).decode("ascii")
+        request = (
+            f"GET {parsed.path or '/'} HTTP/1.1\r\n"
+            f"Host: {parsed.hostname}:{parsed.port}\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\n"
+            "Sec-WebSocket-Version: 13\r\n\r\n"
+        )
+        self._sock.sendall(request.encode("ascii"))
+        header = self._read_until(b"\r\n\r\n")
+        status_line = header.split(b"\r\n", 1)[0]
+        if b" 101 " not in status_line:
+            raise CdpError(f"WebSocket upgrade failed: {status_line.decode(errors='replace')}")
+        self._sock.settimeout(None)
+
+    def _read_until(self, marker: bytes) -> bytes:
+        while marker not in self._buffer:
+            chunk = self._sock.recv(4096)
+            if not chunk:
+                raise CdpError("Connection closed during handshake")
+            self._buffer += chunk
+        head, self._buffer = self._buffer.split(marker, 1)
+        return head
+
+    def _read_exact(self, size: int) -> bytes:
+        while len(self._buffer) < size:
+            chunk = self._sock.recv(max(65536, size - len(self._buffer)))
+            if not chunk:
+                raise CdpError("Connection closed")
+            self._buffer += chunk
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    @staticmethod
+    def _frame(opcode: int, payload: bytes) -> bytes:
+        # Client frames must be masked
+        length = len(payload)
+        if length < 126:
+            header = bytes([0x80 | opcode, 0x80 | length])
+        elif length < 1 << 16:
+            header = bytes([0x80 | opcode, 0x80 | 126]) + struct.pack("!H", length)
+        else:
+            header = bytes([0x80 | opcode, 0x80 | 127]) + struct.pack("!Q", length)
+        mask = os.urandom(4)
+        return header + mask + bytes(byte ^ mask[index % 4] for index, byte in enumerate(payload))
+
+    def _send_frame(self, opcode: int, payload: bytes) -> None:
+        with self._send_lock:
+            self._sock.sendall(self._frame(opcode, payload))
+
+    def send_many(self, texts: List[str]) -> None:
+        # Several frames in one write so pipelined commands leave in a single burst
+        frames = b"".join(self._frame(0x1, text.encode("utf-8")) for text in texts)
+        with self._send_lock:
+            self._sock.sendall(frames)
+
+    def recv_text(self) -> Optional[str]:
+        message = b""
+        while True:
+            first, second = self._read_exact(2)
+            opcode = first & 0x0F
+            length = second & 0x7F
+            if length == 126:
+                length = struct.unpack("!H", self._read_exact(2))[0]
+            elif length == 127:
+                length = struct.unpack("!Q", self._read_exact(8))[0]
+            if second & 0x80:
+                mask = self._read_exact(4)
+                payload = bytes(byte ^ mask[index % 4] for index, byte in enumerate(self._read_exact(length)))
+            else:
+                payload = self._read_exact(length)
+            if opcode == 0x8:
+                return None
+            if opcode == 0x9:
+                self._send_frame(0xA, payload)
+                continue
+            if opcode in (0x0, 0x1, 0x2):
+                message += payload
+                if first & 0x80:
+                    return message.decode("utf-8")
+
+    def close(self) -> None:
+        try:
+            self._send_frame(0x8, b"")
+        except OSError:
+            pass
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+
+
+class CdpConnection:
+    def __init__(self, ws_url: str) -> None:
+        self._socket = WebSocket(ws_url)
+        self._next_id = 0
+        self._id_lock = threading.Lock()
+        self._pending: Dict[int, Tuple[threading.Event, Dict[str, Any]]] = {}
+        self._listeners: Dict[str, List[Callable[[Dict[str, Any]], None]]] = {}
+        self._closed = False
+        self.command_hook: Optional[CommandHook] = None
+        self._reader = threading.Thread(target=self._read_loop, daemon=True)
+        self._reader.start()
+
+    def _read_loop(self) -> None:
+        while True:
+            try:
+                text = self._socket.recv_text()
+            except (OSError, CdpError):
+                text = None
+            if text is None:
+                self._closed = True
+                for done, slot in list(self._pending.values()):
+                    slot.setdefault("error", {"message": "connection closed"})
+                    done.set()
+                return
+            message = json.loads(text)
+            if "id" in message:
+                entry = self._pending.get(message["id"])
+                if entry is not None:
+                    entry[1].update(message)
+                    entry[0].set()
+            else:
+                for listener in list(self._listeners.get(message.get("method", ""), [])):
+                    listener(message.get("params", {}))
+
+    def on(self, method: str, callback: Callable[[Dict[str, Any]], None]) -> None:
+        self._listeners.setdefault(method, []).append(callback)
+
+    def off(self, method: str, callback: Callable[[Dict[str, Any]], None]) -> None:
+        if callback in self._listeners.get(method, []):
+            self._listeners[method].remove(callback)
+
+    def _register(self) -> int:
+        with self._id_lock:
+            self._next_id += 1
+            command_id = self._next_id
+        self._pending[command_id] = (threading.Event(), {})
+        return command_id
+
+    def _await(
+        self, command_id: int, method: str, params: Optional[Dict[str, Any]], sent: float, timeout: float
+    ) -> Any:
+        done, slot = self._pending[command_id]
+        if not done.wait(timeout):
+            self._pending.pop(command_id, None)
+            raise CdpError(f"{method} timed out after {timeout:.1f} s")
+        self._pending.pop(command_id, None)
+        if self.command_hook is not None:
+            self.command_hook(method, params, (time.perf_counter() - sent) * 1000)
+        if "error" in slot:
+            raise CdpError(f"{method} failed: {slot['error'].get('message')}")
+        return slot.get("result", {})
+
+    def call(self, method: str, params: Optional[Dict[str, Any]] = None, timeout: float = 30.0) -> Any:
+        return self.pipeline([(method, params)], timeout)[0]
+
+    def pipeline(self, commands: List[Tuple[str, Optional[Dict[str, Any]]]], timeout: float = 30.0) -> List[Any]:
+        # All commands go out before any reply is awaited; Chrome runs them in order on the page
+        if self._closed:
+            raise CdpError("DevTools connection is closed")
+        ids = []
+        texts = []
+        for method, params in commands:
+            command_id = self._register()
+            ids.append(command_id)
+            texts.append(json.dumps({"id": command_id, "method": method, "params": params or {}}))
+        sent = time.perf_counter()
+        self._socket.send_many(texts)
+        return [
+            self._await(command_id, method, params, sent, timeout)
+            for command_id, (method, params) in zip(ids, commands)
+        ]
+
+    def close(self) -> None:
+        self._closed = True
+        self._socket.close()
+
+
+class ChromeProcess:
+    def __init__(self, headless: bool = False, extra_args: Optional[List[str]] = None) -> None:
+        chrome = find_chrome()
+        self.user_data_dir = tempfile.mkdtemp(prefix="usc-cdp-")
+        args = [
+            chrome,
+            "--remote-debugging-port=0",
+            f"--user-data-dir={self.user_data_dir}",
+            "--no-first-run",
+            "--no-default-browser-check",
+            "--start-maximized",
+        ]
+        if headless:
+            args.append("--headless=new")
+        args.extend(extra_args or [])
+        args.append("about:blank")
+        creationflags = subprocess.CREATE_NEW_PROCESS_GROUP if sys.platform == "win32" else 0
+        try:
+            self.process = subprocess.Popen(
+                args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, creationflags=creationflags
+            )
+        except OSError:
+            shutil.rmtree(self.user_data_dir, ignore_errors=True)
+            raise
+        try:
+            self.port = self._wait_for_port()
+        except BaseException:
+            # Never leave a half-started Chrome or its profile directory behind
+            self.terminate()
+            raise
+
+    def _wait_for_port(self) -> int:
+        # Chrome writes the port it picked to DevToolsActivePort once the endpoint is listening
+        path = os.path.join(self.user_data_dir, "DevToolsActivePort")
+        deadline = time.time() + LAUNCH_TIMEOUT_S
+        while time.time() < deadline:
+            if self.process.poll() is not None:
+                raise CdpError("Chrome exited during startup")
+            try:
+                with open(path, "r", encoding="utf-8") as handle:
+                    first_line = handle.readline().strip()
+                if first_line:
+                    return int(first_line)
+            except (OSError, ValueError):
+                pass
+            time.sleep(0.05)
+        raise CdpError("Chrome did not open its DevTools port in time")
+
+    def page_websocket_url(self) -> str:
+        with urllib.request.urlopen(f"http://127.0.0.1:{self.port}/json/list", timeout=5) as response:
+            targets = json.load(response)
+        for target in targets:
+            if target.get("type") == "page" and target.get("webSocketDebuggerUrl"):
+                return target["webSocketDebuggerUrl"]
+        raise CdpError("No page target to attach to")
+
+    def terminate(self) -> None:
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        shutil.rmtree(self.user_data_dir, ignore_errors=True)
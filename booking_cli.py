@@ -0,0 +1,151 @@
+import argparse
+import threading
+import time
+from datetime import datetime
+
+from booking_config import ENGINE_NAMES, format_time_of_day, load_preferences, parse_time_of_day
+from booking_history import BookingHistory, format_slot_stats
+from booking_scheduler import BOOKING_URL, DAY_NAMES, BookingScheduler, fill_form, get_credentials
+from booking_telemetry import BookingEvents
+
+
+def _print_event(event: dict) -> None:
+    kind = event.get("kind")
+    if kind == "warmup":
+        print(f"[warm-up] {event['stage']} ({event['progress']:.0%})")
+    elif kind == "worker":
+        print(f"[worker] pid {event['pid']}, cpus {event['cpus'] or 'any'}, priority {event['priority'] or 'default'}")
+    elif kind == "clock_offset":
+        print(f"[clock] offset vs site: {event['offset_ms']} ms")
+    elif kind == "next_fire" and event.get("fire_at"):
+        print(f"[next] {event['day']} slot fires at {time.ctime(event['fire_at'])}")
+    elif kind == "outcome":
+        print(f"[outcome] {event['status']} in {event['total_ms']:.0f} ms")
+        if event.get("claim_ms") is not None:
+            print(f"[lease] claimed in {event['claim_ms']:.1f} ms")
+        if event.get("booked_by"):
+            abort = "unknown" if event.get("abort_ms") is None else f"{event['abort_ms']:.1f} ms"
+            print(f"[lease] {event['booked_by']} booked first, aborted after {abort}")
+
+
+def _time_of_day(value: str) -> str:
+    # Stored in the schedule's canonical form so rehearsal history lines up with the scheduled slot
+    parsed = parse_time_of_day(value)
+    if parsed is None:
+        raise argparse.ArgumentTypeError(f"invalid time of day: {value!r}, expected HH:MM[:SS[.mmm]]")
+    return format_time_of_day(parsed)
+
+
+def run_scheduler(args: argparse.Namespace) -> None:
+    email, password = get_credentials()
+    scheduler = BookingScheduler()
+    scheduler.events.subscribe(_print_event)
+    scheduler.start(email, password)
+    try:
+        while scheduler.is_running():
+            time.sleep(1)
+    except KeyboardInterrupt:
+        scheduler.stop()
+
+
+def run_rehearsal(args: argparse.Namespace) -> None:
+    stop_event = threading.Event()
+    events = BookingEvents()
+    events.subscribe(_print_event)
+    history = BookingHistory()
+    preferences = load_preferences()
+    engine = args.engine or preferences["engine"]
+    prewarm = preferences["prewarm"] if args.prewarm is None else args.prewarm
+
+    def rehearse() -> None:
+        history.record(
+            fill_form(
+                args.at,
+                stop_event,
+                args.day,
+                events=events,
+                rehearsal=True,
+                profile_wire=args.profile,
+                engine=engine,
+                login_url=args.url or BOOKING_URL,
+                prewarm=prewarm,
+            )
+        )
+
+    worker = threading.Thread(target=rehearse, daemon=True)
+    worker.start()
+    try:
+        while worker.is_alive():
+            worker.join(0.5)
+    except KeyboardInterrupt:
+        stop_event.set()
+        worker.join(5)
+    history.flush()
+
+
+def show_history(args: argparse.Namespace) -> None:
+    history = BookingHistory()
+    if args.recent:
+        for run in history.recent_runs(args.recent):
+            started = datetime.fromtimestamp(run["started_at"]).strftime("%Y-%m-%d %H:%M:%S")
+            kind = "rehearsal" if run["rehearsal"] else "booking"
+            latency = f"{run['fire_to_book_ms']:.0f} ms" if run["fire_to_book_ms"] else "-"
+            reload = "-"
+            if run["reload_bytes"] is not None:
+                reload = (
+                    f"{run['reload_bytes']} B, {run['reload_cached'] or 0}/{run['reload_requests']} cached, "
+                    f"{run['reload_opaque'] or 0} opaque"
+                )
+            warm = "warm" if run["prewarm"] else "cold"
+            print(
+                f"{started}  {run['slot_day']:<9} {run['slot_time']:<12} {kind:<9} {run['status']:<9} "
+                f"fire-to-book {latency:>8}  offset {run['fire_offset_ms'] or 0:.0f} ms  {run['engine'] or '-'}  "
+                f"reload {reload} ({warm})"
+            )
+        return
+    stats = history.all_slot_stats(args.weeks)
+    if not stats:
+        print(f"No runs recorded in the last {args.weeks} weeks.")
+    for slot_stats in stats:
+        print(f"{slot_stats['day']:<9} {slot_stats['slot_time']:<12} {format_slot_stats(slot_stats)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="USC padel booking from the command line.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the booking schedule from booking_schedule.json.")
+    run_parser.set_defaults(handler=run_scheduler)
+
+    rehearse_parser = commands.add_parser(
+        "rehearse", help="Run the full booking flow but stop right before the final book click."
+    )
+    rehearse_parser.add_argument("--day", required=True, choices=DAY_NAMES)
+    rehearse_parser.add_argument(
+        "--at", type=_time_of_day, metavar="HH:MM:SS[.mmm]", help="Fire at this time of day instead of immediately."
+    )
+    rehearse_parser.add_argument(
+        "--profile", action="store_true", help="Record every driver command and print a wire profile."
+    )
+    rehearse_parser.add_argument(
+        "--engine", choices=ENGINE_NAMES, help="Browser engine to use instead of the engine preference."
+    )
+    rehearse_parser.add_argument("--url", help="Login page to start from, e.g. the local mock site.")
+    rehearse_parser.add_argument(
+        "--prewarm",
+        action=argparse.BooleanOptionalAction,
+        help="Load the target day and keep connections alive before firing (default: the prewarm preference).",
+    )
+    rehearse_parser.set_defaults(handler=run_rehearsal)
+
+    history_parser = commands.add_parser("history", help="Show win rate and latency per slot from past runs.")
+    history_parser.add_argument("--weeks", type=int, default=8, help="Only include runs from the last N weeks.")
+    history_parser.add_argument("--recent", type=int, metavar="N", help="List the N most recent runs instead.")
+    history_parser.set_defaults(handler=show_history)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
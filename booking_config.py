@@ -1,40 +1,96 @@
 import json
 import os
 import re
+from datetime import time
 from typing import Any, Dict, List
 
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), "booking_schedule.json")
+SCHEMA_VERSION = 2
 DEFAULT_SLOTS = [
-    {"day": "Tuesday", "check_time": "19:00:00", "book_time": "20:00:00"},
-    {"day": "Friday", "check_time": "19:00:00", "book_time": "20:00:00"},
+    {"day": "Tuesday", "check_time": "19:00:00.000", "book_time": "20:00:00.000"},
+    {"day": "Friday", "check_time": "19:00:00.000", "book_time": "20:00:00.000"},
 ]
-DEFAULT_PREFERENCES = {"run_in_background": False}
-HOUR_ONLY_PATTERN = re.compile(r"^(?:[01]\d|2[0-3]):00$")
-HOUR_ONLY_WITH_SECONDS_PATTERN = re.compile(r"^(?:[01]\d|2[0-3]):00:00$")
+DEFAULT_PREFERENCES = {
+    "run_in_background": False,
+    "adaptive_fire": True,
+    "min_pre_fire_ms": 0,
+    "max_pre_fire_ms": 400,
+    "pre_fire_step_ms": 25,
+    "min_warmup_s": 60,
+    "max_warmup_s": 300,
+    "profile_wire": False,
+    "engine": "selenium",
+    # Path to a lease file shared by every agent racing for the same slots; empty runs without coordination
+    "lease_path": "",
+    # Run bookings in a separate process, optionally pinned to CPUs and with raised priority where permitted
+    "isolated_worker": False,
+    "worker_cpus": [],
+    "worker_priority": 0,
+    # Load the target day and keep the site connections alive during warm-up
+    "prewarm": True,
+}
+# HH:MM, HH:MM:SS or HH:MM:SS.mmm (1-3 fraction digits); stored as HH:MM:SS.mmm
+TIME_OF_DAY_PATTERN = re.compile(r"^([01]\d|2[0-3]):([0-5]\d)(?::([0-5]\d)(?:\.(\d{1,3}))?)?$")
+PRE_FIRE_MS_RANGE = (0.0, 5000.0)
+WARMUP_S_RANGE = (10.0, 3600.0)
+ENGINE_NAMES = ("selenium", "cdp")
+DEFAULT_ENGINE = "selenium"
 
 
-def _normalize_hour_time(value: str) -> str | None:
-    cleaned = value.strip()
-    if HOUR_ONLY_WITH_SECONDS_PATTERN.match(cleaned):
-        return cleaned
-    if HOUR_ONLY_PATTERN.match(cleaned):
-        return f"{cleaned}:00"
-    return None
+def parse_time_of_day(value: str) -> time | None:
+    match = TIME_OF_DAY_PATTERN.match(value.strip())
+    if not match:
+        return None
+    hour, minute, second, fraction = match.groups()
+    millisecond = int((fraction or "0").ljust(3, "0"))
+    return time(int(hour), int(minute), int(second or 0), millisecond * 1000)
 
 
-def _clean_slots(slots: List[Dict[str, str]]) -> List[Dict[str, str]]:
-    cleaned_slots: List[Dict[str, str]] = []
+def format_time_of_day(value: time) -> str:
+    return f"{value:%H:%M:%S}.{value.microsecond // 1000:03d}"
+
+
+def _normalize_time_of_day(value: str) -> str | None:
+    parsed = parse_time_of_day(value)
+    if parsed is None:
+        return None
+    return format_time_of_day(parsed)
+
+
+def _clean_offset(value: Any, bounds: tuple[float, float]) -> float | None:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    if not bounds[0] <= value <= bounds[1]:
+        return None
+    return round(float(value), 3)
+
+
+def _clean_slots(slots: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    cleaned_slots: List[Dict[str, Any]] = []
     for slot in slots:
         day = slot.get("day")
         check_time = slot.get("check_time")
         book_time = slot.get("book_time")
         if not isinstance(day, str) or not isinstance(check_time, str) or not isinstance(book_time, str):
             continue
-        normalized_check = _normalize_hour_time(check_time)
-        normalized_book = _normalize_hour_time(book_time)
+        normalized_check = _normalize_time_of_day(check_time)
+        normalized_book = _normalize_time_of_day(book_time)
         if not normalized_check or not normalized_book:
             continue
-        cleaned_slots.append({"day": day, "check_time": normalized_check, "book_time": normalized_book})
+        cleaned_slot: Dict[str, Any] = {"day": day, "check_time": normalized_check, "book_time": normalized_book}
+        # Explicit offsets override the adaptive fire plan; out of range values fall back to adaptive
+        pre_fire_ms = _clean_offset(slot.get("pre_fire_ms"), PRE_FIRE_MS_RANGE)
+        if pre_fire_ms is not None:
+            cleaned_slot["pre_fire_ms"] = pre_fire_ms
+        warmup_s = _clean_offset(slot.get("warmup_s"), WARMUP_S_RANGE)
+        if warmup_s is not None:
+            cleaned_slot["warmup_s"] = warmup_s
+        if slot.get("rehearsal") is True:
+            cleaned_slot["rehearsal"] = True
+        # Without an engine the slot uses the engine preference
+        if slot.get("engine") in ENGINE_NAMES:
+            cleaned_slot["engine"] = slot["engine"]
+        cleaned_slots.append(cleaned_slot)
     return cleaned_slots
 
 
@@ -51,26 +107,39 @@ def _load_payload() -> Dict[str, Any]:
     return payload
 
 
-def load_schedule() -> List[Dict[str, str]]:
+def _write_payload(payload: Dict[str, Any]) -> None:
+    payload["schema_version"] = SCHEMA_VERSION
+    with open(CONFIG_PATH, "w", encoding="utf-8") as handle:
+        json.dump(payload, handle, indent=2)
+        handle.write("\n")
+
+
+def load_schedule() -> List[Dict[str, Any]]:
     payload = _load_payload()
     slots = payload.get("slots")
     if not isinstance(slots, list):
         return list(DEFAULT_SLOTS)
-    cleaned: List[Dict[str, str]] = []
+    cleaned: List[Dict[str, Any]] = []
     for slot in slots:
         if not isinstance(slot, dict):
             continue
         cleaned.append(slot)
-    return _clean_slots(cleaned) or list(DEFAULT_SLOTS)
+    cleaned = _clean_slots(cleaned)
+    # Files written before millisecond times existed are rewritten once in the current format
+    if cleaned and payload.get("schema_version") != SCHEMA_VERSION:
+        payload["slots"] = cleaned
+        try:
+            _write_payload(payload)
+        except OSError:
+            pass
+    return cleaned or list(DEFAULT_SLOTS)
 
 
-def save_schedule(slots: List[Dict[str, str]]) -> None:
+def save_schedule(slots: List[Dict[str, Any]]) -> None:
     cleaned = _clean_slots(slots) or list(DEFAULT_SLOTS)
     payload: Dict[str, Any] = _load_payload()
     payload["slots"] = cleaned
-    with open(CONFIG_PATH, "w", encoding="utf-8") as handle:
-        json.dump(payload, handle, indent=2)
-        handle.write("\n")
+    _write_payload(payload)
 
 
 def load_preferences() -> Dict[str, Any]:
@@ -85,11 +154,9 @@ def load_preferences() -> Dict[str, Any]:
 
 def save_preferences(preferences: Dict[str, Any]) -> None:
     payload: Dict[str, Any] = _load_payload()
-    stored = dict(DEFAULT_PREFERENCES)
+    stored = load_preferences()
     stored.update(preferences)
     payload["preferences"] = stored
     if "slots" not in payload:
         payload["slots"] = list(DEFAULT_SLOTS)
-    with open(CONFIG_PATH, "w", encoding="utf-8") as handle:
-        json.dump(payload, handle, indent=2)
-        handle.write("\n")
+    _write_payload(payload)
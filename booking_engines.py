@@ -0,0 +1,262 @@
+import json
+import threading
+import time
+from typing import Any, List, Optional
+
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from webdriver_manager.chrome import ChromeDriverManager
+
+from booking_cdp import CdpConnection, CdpError, ChromeProcess
+from booking_profiler import WireProfiler
+
+POLL_INTERVAL_MS = 5
+
+
+class BookingTimeout(TimeoutError):
+    pass
+
+
+class SeleniumSession:
+    # Every call is at least one HTTP round trip to chromedriver, which then talks to Chrome
+    name = "selenium"
+
+    def __init__(self, profiler: Optional[WireProfiler] = None) -> None:
+        options = webdriver.ChromeOptions()
+        options.headless = False
+        self.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+        if profiler is not None:
+            profiler.install(self.driver)
+        self.driver.maximize_window()
+
+    def _wait(self, condition: Any, timeout: float, selector: str) -> Any:
+        try:
+            return WebDriverWait(self.driver, timeout).until(condition)
+        except TimeoutException as exc:
+            raise BookingTimeout(f"Timed out after {timeout} s waiting for {selector}") from exc
+
+    def _find_all(self, selector: str) -> List[Any]:
+        return self.driver.find_elements(By.CSS_SELECTOR, selector)
+
+    def _find(self, selector: str, index: int = 0) -> Any:
+        if index == 0:
+            return self.driver.find_element(By.CSS_SELECTOR, selector)
+        return self._find_all(selector)[index]
+
+    def open(self, url: str) -> None:
+        self.driver.get(url)
+
+    def refresh(self) -> None:
+        self.driver.refresh()
+
+    def execute(self, script: str) -> Any:
+        return self.driver.execute_script(script)
+
+    def evaluate(self, expression: str) -> Any:
+        return self.driver.execute_script(f"return ({expression});")
+
+    def wait_for(self, selector: str, timeout: float) -> None:
+        self._wait(EC.presence_of_element_located((By.CSS_SELECTOR, selector)), timeout, selector)
+
+    def wait_clickable(self, selector: str, timeout: float) -> None:
+        self._wait(EC.element_to_be_clickable((By.CSS_SELECTOR, selector)), timeout, selector)
+
+    def wait_gone(self, selector: str, timeout: float) -> None:
+        self._wait(EC.invisibility_of_element_located((By.CSS_SELECTOR, selector)), timeout, selector)
+
+    def click(self, selector: str, index: int = 0, times: int = 1) -> None:
+        element = self._find(selector, index)
+        for _ in range(times):
+            element.click()
+
+    def type_text(self, selector: str, text: str) -> None:
+        self._find(selector).send_keys(text)
+
+    def fill_all(self, selector: str, values: List[str]) -> None:
+        for field, value in zip(self._find_all(selector), values):
+            field.send_keys(value)
+
+    def scroll_to_bottom(self, selector: str) -> None:
+        self.driver.execute_script("arguments[0].scrollTop = arguments[0].scrollHeight", self._find(selector))
+
+    def quit(self) -> None:
+        self.driver.quit()
+
+
+# Page-side helpers for the DevTools engine; each runs as one Runtime.evaluate round trip
+WAIT_SCRIPT = """
+new Promise((resolve) => {
+    const selector = %(selector)s;
+    const mode = %(mode)s;
+    const deadline = performance.now() + %(timeout_ms)d;
+    const matches = () => {
+        const element = document.querySelector(selector);
+        const visible = !!element && element.getClientRects().length > 0;
+        if (mode === "gone") { return !visible; }
+        if (mode === "clickable") { return visible && !element.disabled; }
+        return !!element;
+    };
+    const check = () => {
+        if (matches()) { resolve(true); return; }
+        if (performance.now() > deadline) { resolve(false); return; }
+        setTimeout(check, %(poll_ms)d);
+    };
+    check();
+})
+"""
+CLICK_SCRIPT = """
+(() => {
+    const elements = document.querySelectorAll(%(selector)s);
+    const element = elements[%(index)d < 0 ? elements.length + %(index)d : %(index)d];
+    if (!element) { throw new Error("No element for " + %(selector)s); }
+    element.scrollIntoView({block: "center"});
+    for (let i = 0; i < %(times)d; i++) { element.click(); }
+})()
+"""
+FOCUS_SCRIPT = """
+(() => {
+    const element = document.querySelectorAll(%(selector)s)[%(index)d];
+    if (!element) { throw new Error("No element for " + %(selector)s); }
+    element.focus();
+})()
+"""
+SCROLL_SCRIPT = """
+(() => {
+    const element = document.querySelector(%(selector)s);
+    element.scrollTop = element.scrollHeight;
+})()
+"""
+
+
+class CdpSession:
+    # One persistent DevTools websocket straight to the page; no chromedriver hop
+    name = "cdp"
+
+    def __init__(self, profiler: Optional[WireProfiler] = None, headless: bool = False) -> None:
+        # ChromeProcess cleans up after itself if it fails to start; from here on the session owns it
+        self.chrome = ChromeProcess(headless=headless)
+        try:
+            self.connection = CdpConnection(self.chrome.page_websocket_url())
+            if profiler is not None:
+                self.connection.command_hook = profiler.record
+            self.connection.call("Page.enable")
+        except Exception:
+            self.chrome.terminate()
+            raise
+
+    @staticmethod
+    def _evaluate(expression: str, await_promise: bool = False) -> tuple[str, dict]:
+        return (
+            "Runtime.evaluate",
+            {"expression": expression, "awaitPromise": await_promise, "returnByValue": True},
+        )
+
+    def _value(self, result: dict, description: str) -> Any:
+        if "exceptionDetails" in result:
+            details = result["exceptionDetails"]
+            message = details.get("exception", {}).get("description") or details.get("text")
+            raise CdpError(f"{description} failed: {message}")
+        return result.get("result", {}).get("value")
+
+    def _run(self, expression: str, description: str, timeout: float = 30.0, await_promise: bool = False) -> Any:
+        result = self.connection.call(*self._evaluate(expression, await_promise), timeout=timeout)
+        return self._value(result, description)
+
+    def _navigate(self, method: str, params: Optional[dict], timeout: float = 30.0) -> None:
+        loaded = threading.Event()
+
+        def on_load(_: dict) -> None:
+            loaded.set()
+
+        # Listen before sending so a fast load cannot slip past
+        self.connection.on("Page.loadEventFired", on_load)
+        try:
+            self.connection.call(method, params)
+            if not loaded.wait(timeout):
+                raise BookingTimeout(f"Page did not finish loading within {timeout} s")
+        finally:
+            self.connection.off("Page.loadEventFired", on_load)
+
+    def _wait(self, selector: str, timeout: float, mode: str) -> None:
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            script = WAIT_SCRIPT % {
+                "selector": json.dumps(selector),
+                "timeout_ms": max(int(remaining * 1000), 0),
+                "mode": json.dumps(mode),
+                "poll_ms": POLL_INTERVAL_MS,
+            }
+            try:
+                found = self._run(script, f"waiting for {selector}", timeout=remaining + 5, await_promise=True)
+            except CdpError as exc:
+                # A navigation destroys the page's JS context mid-wait; keep waiting in the new document
+                if "context" not in str(exc).lower() or time.monotonic() >= deadline:
+                    raise
+                time.sleep(POLL_INTERVAL_MS / 1000)
+                continue
+            if not found:
+                raise BookingTimeout(f"Timed out after {timeout} s waiting for {selector}")
+            return
+
+    def open(self, url: str) -> None:
+        self._navigate("Page.navigate", {"url": url})
+
+    def refresh(self) -> None:
+        self._navigate("Page.reload", {"ignoreCache": False})
+
+    def execute(self, script: str) -> Any:
+        return self._run(script, "script")
+
+    def evaluate(self, expression: str) -> Any:
+        return self._run(f"({expression})", "expression")
+
+    def wait_for(self, selector: str, timeout: float) -> None:
+        self._wait(selector, timeout, "present")
+
+    def wait_clickable(self, selector: str, timeout: float) -> None:
+        self._wait(selector, timeout, "clickable")
+
+    def wait_gone(self, selector: str, timeout: float) -> None:
+        self._wait(selector, timeout, "gone")
+
+    def click(self, selector: str, index: int = 0, times: int = 1) -> None:
+        script = CLICK_SCRIPT % {"selector": json.dumps(selector), "index": index, "times": times}
+        self._run(script, f"click {selector}")
+
+    def type_text(self, selector: str, text: str) -> None:
+        self.fill_all(selector, [text])
+
+    def fill_all(self, selector: str, values: List[str]) -> None:
+        # Focus and insert for every field are pipelined into a single burst of frames
+        commands = []
+        for index, value in enumerate(values):
+            focus = FOCUS_SCRIPT % {"selector": json.dumps(selector), "index": index}
+            commands.append(self._evaluate(focus))
+            commands.append(("Input.insertText", {"text": value}))
+        results = self.connection.pipeline(commands)
+        for result in results[::2]:
+            self._value(result, f"focus {selector}")
+
+    def scroll_to_bottom(self, selector: str) -> None:
+        self._run(SCROLL_SCRIPT % {"selector": json.dumps(selector)}, f"scroll {selector}")
+
+    def quit(self) -> None:
+        try:
+            self.connection.call("Browser.close", timeout=5)
+        except CdpError:
+            pass
+        self.connection.close()
+        self.chrome.terminate()
+
+
+def create_session(engine: str, profiler: Optional[WireProfiler] = None) -> Any:
+    if engine == "cdp":
+        return CdpSession(profiler)
+    if engine == "selenium":
+        return SeleniumSession(profiler)
+    raise ValueError(f"Unknown booking engine: {engine}")
@@ -0,0 +1,218 @@
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from booking_adaptive import percentile, sample_from_outcome
+
+HISTORY_PATH = os.path.join(os.path.dirname(__file__), "booking_history.sqlite3")
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    slot_day TEXT NOT NULL,
+    slot_time TEXT NOT NULL,
+    run_date TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    account TEXT,
+    engine TEXT,
+    rehearsal INTEGER NOT NULL DEFAULT 0,
+    fire_offset_ms REAL,
+    fire_error_ms REAL,
+    status TEXT NOT NULL,
+    error TEXT,
+    total_ms REAL,
+    prepare_ms REAL,
+    refresh_ms REAL,
+    fire_to_book_ms REAL,
+    last_phase TEXT,
+    phases TEXT NOT NULL,
+    claim_ms REAL,
+    abort_ms REAL,
+    prewarm INTEGER,
+    reload_requests INTEGER,
+    reload_bytes INTEGER,
+    reload_cached INTEGER,
+    reload_opaque INTEGER,
+    site_arrival_ms REAL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_slot_date ON runs (slot_day, slot_time, run_date);
+CREATE INDEX IF NOT EXISTS idx_runs_date ON runs (run_date);
+"""
+INSERT = """
+INSERT INTO runs (
+    slot_day, slot_time, run_date, started_at, account, engine, rehearsal, fire_offset_ms, fire_error_ms,
+    status, error, total_ms, prepare_ms, refresh_ms, fire_to_book_ms, last_phase, phases, claim_ms, abort_ms,
+    prewarm, reload_requests, reload_bytes, reload_cached, reload_opaque, site_arrival_ms
+) VALUES (
+    :slot_day, :slot_time, :run_date, :started_at, :account, :engine, :rehearsal, :fire_offset_ms, :fire_error_ms,
+    :status, :error, :total_ms, :prepare_ms, :refresh_ms, :fire_to_book_ms, :last_phase, :phases, :claim_ms, :abort_ms,
+    :prewarm, :reload_requests, :reload_bytes, :reload_cached, :reload_opaque, :site_arrival_ms
+)
+"""
+# Runs that never reached a real booking attempt do not count towards the win rate,
+# and neither do runs that yielded to another agent of ours that booked the slot
+ATTEMPT_STATUSES = ("booked", "no_slots", "failed", "unconfirmed")
+ADHOC_SLOT_TIME = "-"
+
+
+def _row_from_outcome(outcome: Dict[str, Any]) -> Dict[str, Any]:
+    sample = sample_from_outcome(outcome)
+    started_at = outcome.get("started_at") or time.time()
+    # Date the run by its fire instant so a warm-up that starts before midnight lands on the right day
+    fired_at = outcome.get("fired_at") or started_at
+    return {
+        "slot_day": outcome.get("day") or "",
+        "slot_time": outcome.get("target_time") or ADHOC_SLOT_TIME,
+        "run_date": datetime.fromtimestamp(fired_at).date().isoformat(),
+        "started_at": started_at,
+        "account": outcome.get("account"),
+        "engine": outcome.get("engine"),
+        "rehearsal": int(bool(outcome.get("rehearsal"))),
+        "fire_offset_ms": outcome.get("fire_offset_ms"),
+        "fire_error_ms": outcome.get("fire_error_ms"),
+        "status": outcome.get("status") or "failed",
+        "error": outcome.get("error"),
+        "total_ms": outcome.get("total_ms"),
+        "prepare_ms": sample["prepare_ms"],
+        "refresh_ms": sample.get("refresh_ms"),
+        "fire_to_book_ms": sample["fire_to_book_ms"] or None,
+        "last_phase": sample["last_phase"],
+        "phases": json.dumps(outcome.get("phases", [])),
+        "claim_ms": outcome.get("claim_ms"),
+        "abort_ms": outcome.get("abort_ms"),
+        "prewarm": None if outcome.get("prewarm") is None else int(bool(outcome["prewarm"])),
+        "reload_requests": outcome.get("reload_requests"),
+        "reload_bytes": outcome.get("reload_bytes"),
+        "reload_cached": outcome.get("reload_cached"),
+        "reload_opaque": outcome.get("reload_opaque"),
+        "site_arrival_ms": sample["site_arrival_ms"],
+    }
+
+
+class BookingHistory:
+    def __init__(self, path: str = HISTORY_PATH) -> None:
+        self.path = path
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        with self._connect() as connection:
+            connection.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=5)
+        connection.row_factory = sqlite3.Row
+        # WAL lets the GUI and CLI read while the writer thread is inserting
+        connection.execute("PRAGMA journal_mode=WAL")
+        return connection
+
+    def record(self, outcome: Dict[str, Any]) -> None:
+        # Only enqueues; the insert happens on the writer thread
+        self._queue.put(_row_from_outcome(outcome))
+        self._ensure_writer()
+
+    def flush(self, timeout: float = 2.0) -> bool:
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def _ensure_writer(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._write_loop, daemon=True)
+                self._thread.start()
+
+    def _write_loop(self) -> None:
+        connection = self._connect()
+        while True:
+            row = self._queue.get()
+            try:
+                with connection:
+                    connection.execute(INSERT, row)
+            except sqlite3.Error as exc:
+                print(f"Could not store booking history: {exc}")
+            finally:
+                self._queue.task_done()
+
+    def recent_samples(self, day: str, slot_time: str, limit: int) -> List[Dict[str, Any]]:
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT status, rehearsal, fire_offset_ms, prepare_ms, refresh_ms, fire_to_book_ms, last_phase, "
+                "site_arrival_ms FROM runs WHERE slot_day = ? AND slot_time = ? "
+                "ORDER BY run_date DESC, started_at DESC LIMIT ?",
+                (day, slot_time, limit),
+            ).fetchall()
+        samples = [dict(row) for row in reversed(rows)]
+        for sample in samples:
+            sample["rehearsal"] = bool(sample["rehearsal"])
+        return samples
+
+    def recent_runs(self, limit: int = 20) -> List[Dict[str, Any]]:
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT * FROM runs ORDER BY started_at DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        runs = [dict(row) for row in rows]
+        for run in runs:
+            run["phases"] = json.loads(run["phases"])
+        return runs
+
+    def slot_stats(self, day: str, slot_time: str, weeks: int = 8) -> Dict[str, Any]:
+        since = (date.today() - timedelta(weeks=weeks)).isoformat()
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT status, rehearsal, fire_to_book_ms FROM runs "
+                "WHERE slot_day = ? AND slot_time = ? AND run_date >= ?",
+                (day, slot_time, since),
+            ).fetchall()
+        return self._summarize(day, slot_time, weeks, rows)
+
+    def all_slot_stats(self, weeks: int = 8) -> List[Dict[str, Any]]:
+        since = (date.today() - timedelta(weeks=weeks)).isoformat()
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT slot_day, slot_time, status, rehearsal, fire_to_book_ms FROM runs "
+                "WHERE run_date >= ? AND slot_time != ? ORDER BY slot_day, slot_time",
+                (since, ADHOC_SLOT_TIME),
+            ).fetchall()
+        grouped: Dict[tuple[str, str], List[sqlite3.Row]] = {}
+        for row in rows:
+            grouped.setdefault((row["slot_day"], row["slot_time"]), []).append(row)
+        return [self._summarize(day, slot_time, weeks, slot_rows) for (day, slot_time), slot_rows in grouped.items()]
+
+    @staticmethod
+    def _summarize(day: str, slot_time: str, weeks: int, rows: List[sqlite3.Row]) -> Dict[str, Any]:
+        attempts = [row for row in rows if not row["rehearsal"] and row["status"] in ATTEMPT_STATUSES]
+        booked = sum(1 for row in attempts if row["status"] == "booked")
+        # Only these runs clicked the book button; the rest stopped early or timed out on the way there
+        clicked = [row for row in attempts if row["status"] in ("booked", "unconfirmed")]
+        latencies = [row["fire_to_book_ms"] for row in clicked if row["fire_to_book_ms"]]
+        return {
+            "day": day,
+            "slot_time": slot_time,
+            "weeks": weeks,
+            "runs": len(rows),
+            "attempts": len(attempts),
+            "booked": booked,
+            "win_rate": booked / len(attempts) if attempts else None,
+            "p50_ms": percentile(latencies, 0.5) if latencies else None,
+            "p95_ms": percentile(latencies, 0.95) if latencies else None,
+        }
+
+
+def format_slot_stats(stats: Dict[str, Any]) -> str:
+    if stats["attempts"]:
+        win = f"won {stats['booked']}/{stats['attempts']} ({stats['win_rate']:.0%})"
+    else:
+        win = "no booking attempts"
+    latency = f"p95 {stats['p95_ms']:.0f} ms" if stats["p95_ms"] is not None else "no latency data"
+    return f"{win}, {latency} over {stats['weeks']} weeks"
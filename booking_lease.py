@@ -0,0 +1,201 @@
+import os
+import socket
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# Several agents (processes or machines sharing this file) race for the same slot.
+# Only the lease holder may press the final book button; a confirmed booking ends the race for everyone.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS leases (
+    slot_key TEXT PRIMARY KEY,
+    holder TEXT NOT NULL,
+    state TEXT NOT NULL,
+    claimed_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    booked_at REAL,
+    booked_host TEXT,
+    booked_offset REAL
+);
+"""
+LEASE_TTL_S = 15.0
+POLL_INTERVAL_S = 0.002
+# Nobody can book before the fire, so the watcher idles until arm() and keeps the warm-up free of GIL churn
+WARMUP_POLL_INTERVAL_S = 0.5
+
+
+def default_holder(account: Optional[str] = None) -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{account or '-'}"
+
+
+def lease_key(day: str, target_time: str, run_date: str) -> str:
+    return f"{day}|{target_time}|{run_date}"
+
+
+def open_lease(spec: Optional[Dict[str, str]]) -> Optional["SlotLease"]:
+    # spec is {"path", "key", "holder"}; a plain dict so it can cross a process boundary
+    if not spec:
+        return None
+    return SlotLease(LeaseStore(spec["path"]), spec["key"], spec["holder"])
+
+
+class LeaseStore:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with self._connect() as connection:
+            connection.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode so try_claim() controls its own BEGIN IMMEDIATE transaction.
+        # A lease may be created on the scheduler thread and used on the booking thread.
+        connection = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA journal_mode=WAL")
+        return connection
+
+    def try_claim(self, connection: sqlite3.Connection, key: str, holder: str, ttl: float) -> Dict[str, Any]:
+        # BEGIN IMMEDIATE takes the write lock up front, so two agents can never both see a free lease
+        now = time.time()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute("SELECT * FROM leases WHERE slot_key = ?", (key,)).fetchone()
+            expired = row is not None and row["state"] == "claimed" and row["expires_at"] < now
+            free = row is None or row["state"] == "released" or expired
+            if free or (row["holder"] == holder and row["state"] == "claimed"):
+                connection.execute(
+                    "INSERT OR REPLACE INTO leases (slot_key, holder, state, claimed_at, expires_at, booked_at) "
+                    "VALUES (?, ?, 'claimed', ?, ?, NULL)",
+                    (key, holder, now, now + ttl),
+                )
+                row = {"slot_key": key, "holder": holder, "state": "claimed", "claimed_at": now, "booked_at": None}
+            connection.execute("COMMIT")
+        except sqlite3.Error:
+            connection.execute("ROLLBACK")
+            raise
+        return dict(row)
+
+    def read(self, connection: sqlite3.Connection, key: str) -> Optional[Dict[str, Any]]:
+        row = connection.execute("SELECT * FROM leases WHERE slot_key = ?", (key,)).fetchone()
+        return dict(row) if row is not None else None
+
+    def mark(
+        self, connection: sqlite3.Connection, key: str, holder: str, state: str, clock_offset: Optional[float] = None
+    ) -> None:
+        # A booking also records where it happened and that host's offset to the site clock,
+        # so agents on other machines can put booked_at on their own clock
+        booked = state == "booked"
+        connection.execute(
+            "UPDATE leases SET state = ?, booked_at = ?, booked_host = ?, booked_offset = ? "
+            "WHERE slot_key = ? AND holder = ?",
+            (
+                state,
+                time.time() if booked else None,
+                socket.gethostname() if booked else None,
+                clock_offset if booked else None,
+                key,
+                holder,
+            ),
+        )
+
+
+class SlotLease:
+    def __init__(self, store: LeaseStore, key: str, holder: str, ttl: float = LEASE_TTL_S) -> None:
+        self.store = store
+        self.key = key
+        self.holder = holder
+        self.ttl = ttl
+        self.metrics: Dict[str, Any] = {}
+        # Seconds the site clock runs ahead of this machine, set once the booking flow has measured it
+        self.clock_offset: Optional[float] = None
+        self.abort_event = threading.Event()
+        self._connection = store._connect()
+        self.holding = False
+        self._watcher: Optional[threading.Thread] = None
+        self._closed = threading.Event()
+        self._armed = threading.Event()
+
+    def watch(self, stop_event: threading.Event) -> threading.Event:
+        # Returns an event that fires on an outside stop or as soon as another agent confirms a booking
+        self._watcher = threading.Thread(target=self._watch_loop, args=(stop_event,), daemon=True)
+        self._watcher.start()
+        return self.abort_event
+
+    def arm(self) -> None:
+        # Called at the fire instant; from here on another agent may book at any moment
+        self._armed.set()
+
+    def _watch_loop(self, stop_event: threading.Event) -> None:
+        connection = self.store._connect()
+        try:
+            while not self._closed.is_set():
+                if stop_event.is_set():
+                    self.abort_event.set()
+                    return
+                if self._booked_elsewhere(self.store.read(connection, self.key)):
+                    return
+                if self._armed.is_set():
+                    time.sleep(POLL_INTERVAL_S)
+                else:
+                    self._armed.wait(WARMUP_POLL_INTERVAL_S)
+        finally:
+            connection.close()
+
+    def _booked_elsewhere(self, lease: Optional[Dict[str, Any]]) -> bool:
+        if not lease or lease["state"] != "booked" or lease["holder"] == self.holder:
+            return False
+        if not self.abort_event.is_set():
+            now = time.time()
+            elapsed = self._since_booking(lease, now)
+            self.metrics["booked_by"] = lease["holder"]
+            # On this machine's clock, or None when the two clocks cannot be related
+            self.metrics["booked_elsewhere_at"] = None if elapsed is None else now - elapsed
+            self.metrics["abort_signal_ms"] = None if elapsed is None else round(elapsed * 1000, 3)
+            self.abort_event.set()
+        return True
+
+    def _since_booking(self, lease: Dict[str, Any], now: float) -> Optional[float]:
+        # Wall clocks only compare directly on one host. Across hosts both sides are mapped onto the site clock,
+        # so the result also carries the error of the two Date-header offset estimates (tens of ms at worst)
+        if lease["booked_host"] == socket.gethostname():
+            return now - lease["booked_at"]
+        if self.clock_offset is None or lease["booked_offset"] is None:
+            return None
+        return (now + self.clock_offset) - (lease["booked_at"] + lease["booked_offset"])
+
+    def lost(self) -> bool:
+        return "booked_by" in self.metrics
+
+    def claim(self) -> bool:
+        # Waits while another agent holds the lease; gets it if that agent releases or its lease expires
+        start = time.perf_counter()
+        attempts = 0
+        while not self.abort_event.is_set():
+            attempts += 1
+            lease = self.store.try_claim(self._connection, self.key, self.holder, self.ttl)
+            if lease["holder"] == self.holder and lease["state"] == "claimed":
+                self.holding = True
+                self.metrics["claim_ms"] = round((time.perf_counter() - start) * 1000, 3)
+                self.metrics["claim_attempts"] = attempts
+                return True
+            if self._booked_elsewhere(lease):
+                return False
+            time.sleep(POLL_INTERVAL_S)
+        return False
+
+    def confirm(self) -> None:
+        self.store.mark(self._connection, self.key, self.holder, "booked", self.clock_offset)
+        self.holding = False
+
+    def release(self) -> None:
+        self.store.mark(self._connection, self.key, self.holder, "released")
+        self.holding = False
+
+    def close(self) -> None:
+        # A holder that never confirmed hands the slot to the next agent instead of waiting for expiry
+        if self.holding:
+            self.release()
+        self._closed.set()
+        if self._watcher is not None:
+            self._watcher.join(1)
+        self._connection.close()
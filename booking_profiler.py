@@ -0,0 +1,115 @@
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from booking_telemetry import PhaseTrace
+
+PROFILES_DIR = os.path.join(os.path.dirname(__file__), "profiles")
+SCRIPT_PREVIEW_CHARS = 48
+
+
+def summarize_params(command: str, params: Optional[Dict[str, Any]]) -> str:
+    if not params:
+        return ""
+    parts: List[str] = []
+    if "using" in params and "value" in params:
+        parts.append(f"{params['using']}={params['value']}")
+    elif "text" in params or "value" in params:
+        # Typed text can be a password, so only its length is kept
+        text = params.get("text", params.get("value"))
+        length = len(text) if isinstance(text, str) else len(text or [])
+        parts.append(f"<{length} chars>")
+    script = params.get("script", params.get("expression"))
+    if script is not None:
+        script = " ".join(str(script).split())
+        if len(script) > SCRIPT_PREVIEW_CHARS:
+            script = f"{script[:SCRIPT_PREVIEW_CHARS]}..."
+        parts.append(script)
+    if "url" in params:
+        parts.append(str(params["url"]))
+    if "id" in params and isinstance(params["id"], str):
+        parts.append(f"element {params['id'][:8]}")
+    return " ".join(parts)
+
+
+class WireProfiler:
+    def __init__(self, trace: PhaseTrace) -> None:
+        self.trace = trace
+        self.commands: List[Dict[str, Any]] = []
+
+    def install(self, driver: Any) -> None:
+        # Every WebDriver command goes through command_executor.execute, one HTTP round trip each
+        executor = driver.command_executor
+        original = executor.execute
+
+        def profiled_execute(command: str, params: Optional[Dict[str, Any]] = None) -> Any:
+            start = time.perf_counter()
+            try:
+                return original(command, params)
+            finally:
+                self.record(command, params, (time.perf_counter() - start) * 1000)
+
+        executor.execute = profiled_execute
+
+    def record(self, command: str, params: Optional[Dict[str, Any]], latency_ms: float) -> None:
+        self.commands.append(
+            {
+                "phase": self.trace.current or "idle",
+                "command": command,
+                "args": summarize_params(command, params),
+                "latency_ms": round(latency_ms, 3),
+            }
+        )
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        phases: Dict[str, Dict[str, Any]] = {}
+        for entry in self.commands:
+            phase = phases.setdefault(entry["phase"], {"round_trips": 0, "total_ms": 0.0, "commands": {}})
+            phase["round_trips"] += 1
+            phase["total_ms"] += entry["latency_ms"]
+            command = phase["commands"].setdefault(entry["command"], {"count": 0, "total_ms": 0.0})
+            command["count"] += 1
+            command["total_ms"] += entry["latency_ms"]
+        return phases
+
+    def redundant(self) -> List[Dict[str, Any]]:
+        # The same command with the same arguments more than once in a phase is a candidate to cache or batch
+        seen: Dict[tuple[str, str, str], int] = {}
+        for entry in self.commands:
+            if not entry["args"]:
+                continue
+            key = (entry["phase"], entry["command"], entry["args"])
+            seen[key] = seen.get(key, 0) + 1
+        return [
+            {"phase": phase, "command": command, "args": args, "count": count}
+            for (phase, command, args), count in seen.items()
+            if count > 1
+        ]
+
+    def folded(self) -> List[str]:
+        # flamegraph.pl / speedscope folded stacks, weighted in microseconds
+        weights: Dict[str, int] = {}
+        for entry in self.commands:
+            stack = f"booking;{entry['phase']};{entry['command']}"
+            weights[stack] = weights.get(stack, 0) + int(entry["latency_ms"] * 1000)
+        return [f"{stack} {weight}" for stack, weight in weights.items()]
+
+    def format(self) -> str:
+        lines = [f"Wire profile: {len(self.commands)} driver round trips"]
+        for name, phase in self.summary().items():
+            lines.append(f"  {name:<16} {phase['round_trips']:>4} round trips {phase['total_ms']:>10.1f} ms")
+            ordered = sorted(phase["commands"].items(), key=lambda item: item[1]["total_ms"], reverse=True)
+            for command, stats in ordered:
+                lines.append(f"    {command:<28} x{stats['count']:<4} {stats['total_ms']:>10.1f} ms")
+        for entry in self.redundant():
+            lines.append(f"  repeated in {entry['phase']}: {entry['command']} {entry['args']} x{entry['count']}")
+        return "\n".join(lines)
+
+    def save(self, label: str) -> str:
+        os.makedirs(PROFILES_DIR, exist_ok=True)
+        path = os.path.join(PROFILES_DIR, f"{datetime.now():%Y%m%d-%H%M%S}-{label}.folded")
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write("\n".join(self.folded()))
+            handle.write("\n")
+        return path
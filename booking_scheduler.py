@@ -1,19 +1,74 @@
+import json
+import os
 import threading
 import time
-from datetime import datetime, timedelta
-from typing import Callable, Optional
+from dataclasses import dataclass
+from datetime import datetime, time as day_time, timedelta
+from typing import Any, Callable, Dict, Optional
 
 import schedule
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 
-from booking_config import load_schedule
+from booking_adaptive import format_fire_plan, load_fire_plan
+from booking_config import DEFAULT_ENGINE, load_preferences, load_schedule, parse_time_of_day
+from booking_engines import BookingTimeout, create_session
+from booking_history import BookingHistory
+from booking_lease import SlotLease, default_holder, lease_key, open_lease
+from booking_profiler import WireProfiler
+from booking_telemetry import BookingEvents, PhaseTrace, measure_clock_offset
+from booking_worker import BookingWorker
 
 DAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+BOOKING_URL = "https://my.uscsport.nl/pages/login"
+SLOT_BUTTON = '[data-test-id="bookable-slot-book-button"]'
+BOOK_BUTTON = '[data-test-id="details-book-button"]'
+CONFIRM_TIMEOUT_S = 10
+CONFIRM_POLL_S = 0.02
+WARMUP_STAGES = ["launch", "login", "filter", "clock", "prewarm", "armed"]
+DAY_BUTTON = '[data-test-id="day-button"][data-test-id-day-button-number="{index}"]'
+PREWARM_IDLE_MS = 500
+PREWARM_TIMEOUT_S = 5.0
+KEEPALIVE_INTERVAL_MS = 15000
+# No keep-alive request may still be in flight on the connection the fire-time reload wants
+KEEPALIVE_QUIET_MS = 500
+KEEPALIVE_SCRIPT = """
+(() => {
+    const quietAt = %(quiet_at_ms)d;
+    // Every tick sends; the last one is timed for quietAt itself, so the pool is fresh right before the fire
+    const ping = () => {
+        fetch(location.href, {method: "HEAD", cache: "no-store", credentials: "include"}).catch(() => {});
+        const remaining = quietAt - Date.now();
+        if (remaining > 0) { setTimeout(ping, Math.min(%(interval_ms)d, remaining)); }
+    };
+    if (Date.now() < quietAt) { ping(); }
+})()
+"""
+# After the book click the details modal either closes (confirmed) or stays open with the button relabelled
+# or an error shown (refused); recognising the refusal lets a lease holder hand the slot on at once
+BOOK_RESULT_SCRIPT = """
+(() => {
+    const button = document.querySelector(%(selector)s);
+    if (!button || !button.getClientRects().length) { return "confirmed"; }
+    const modal = button.closest(".modal-content") || document;
+    const refusedLabel = /\\b(taken|unavailable|not available|full|bezet|vol|niet beschikbaar)\\b/i;
+    const refused = refusedLabel.test(button.textContent) || modal.querySelector('[role="alert"], .alert-danger');
+    return refused ? "refused" : "pending";
+})()
+"""
+# Resource Timing of the current document: transferSize is 0 for cache hits and only headers for a 304.
+# Cross-origin responses without Timing-Allow-Origin zero their sizes and timings, so they are counted apart
+# as opaque instead of passing for cache hits or empty transfers
+RELOAD_TRAFFIC_SCRIPT = """
+(() => {
+    const entries = performance.getEntriesByType("navigation").concat(performance.getEntriesByType("resource"));
+    const visible = entries.filter((entry) => entry.responseStart > 0 || entry.transferSize > 0);
+    return {
+        requests: entries.length,
+        bytes: visible.reduce((total, entry) => total + entry.transferSize, 0),
+        cached: visible.filter((entry) => entry.transferSize === 0 && entry.decodedBodySize > 0).length,
+        opaque: entries.length - visible.length,
+    };
+})()
+"""
 
 
 def get_credentials() -> tuple[str, str]:
@@ -28,81 +83,284 @@ def get_credentials() -> tuple[str, str]:
     return email, password
 
 
+def run_day_for(day: str) -> str:
+    return DAY_NAMES[(DAY_NAMES.index(day) - 6) % 7]
+
+
+def _parse_target(value: str) -> day_time:
+    parsed = parse_time_of_day(value)
+    if parsed is None:
+        raise ValueError(f"Invalid time of day: {value}")
+    return parsed
+
+
+def next_fire_time(day: str, book_time: str, now: Optional[datetime] = None) -> datetime:
+    now = now or datetime.now()
+    book_at = _parse_target(book_time)
+    run_index = DAY_NAMES.index(run_day_for(day))
+    candidate = datetime.combine(now.date(), book_at)
+    candidate += timedelta(days=(run_index - now.weekday()) % 7)
+    if candidate <= now:
+        candidate += timedelta(days=7)
+    return candidate
+
+
+def fire_timestamp(target_time: str, pre_fire_ms: float = 0.0, now: Optional[datetime] = None) -> float:
+    now = now or datetime.now()
+    fire_at = datetime.combine(now.date(), _parse_target(target_time))
+    # Warm-up for a slot just after midnight starts the evening before
+    if fire_at < now - timedelta(hours=12):
+        fire_at += timedelta(days=1)
+    return fire_at.timestamp() - pre_fire_ms / 1000
+
+
+def wait_until(timestamp: float, stop_event: threading.Event) -> bool:
+    # Sleep in short steps to stay responsive to stop, then spin for the last few milliseconds
+    while True:
+        remaining = timestamp - time.time()
+        if stop_event.is_set():
+            return False
+        if remaining <= 0.02:
+            break
+        time.sleep(min(remaining - 0.02, 0.01))
+    while time.time() < timestamp:
+        pass
+    return not stop_event.is_set()
+
+
+@dataclass
+class BookingOptions:
+    # A rehearsal runs the whole flow but stops right before the final book click
+    rehearsal: bool = False
+    credentials: Optional[tuple[str, str]] = None
+    pre_fire_ms: float = 0.0
+    # Times every driver command, which adds a little overhead per round trip
+    profile_wire: bool = False
+    # Selenium or the direct DevTools connection
+    engine: str = DEFAULT_ENGINE
+    # Lets benchmarks aim at a local site
+    login_url: str = BOOKING_URL
+    # Opens the target day during warm-up and keeps the site connections busy until just before the fire
+    prewarm: bool = False
+
+
+@dataclass
+class BookingRun:
+    # Everything one run of the booking flow needs, handed down as a whole instead of argument by argument
+    target_time: Optional[str]
+    target_day: str
+    stop_event: threading.Event
+    trace: PhaseTrace
+    options: BookingOptions
+    on_complete: Optional[Callable[[str, str], None]] = None
+    lease: Optional[SlotLease] = None
+
+
 def fill_form(
-    target_time: str,
+    target_time: Optional[str],
     stop_event: threading.Event,
     target_day: str,
     on_complete: Optional[Callable[[str, str], None]] = None,
-) -> None:
-    email, password = get_credentials()
+    events: Optional[BookingEvents] = None,
+    lease: Optional[SlotLease] = None,
+    **options: Any,
+) -> Dict[str, Any]:
+    # options are the BookingOptions fields, as keywords so they also travel as a plain dict to the worker.
+    # Without a target time it fires as soon as the browser is armed.
+    # With a lease, only the agent holding it presses book and the run aborts once another agent has booked.
+    run_options = BookingOptions(**options)
+    trace = PhaseTrace(
+        events,
+        day=target_day,
+        target_time=target_time,
+        rehearsal=run_options.rehearsal,
+        fire_offset_ms=run_options.pre_fire_ms,
+        engine=run_options.engine,
+        prewarm=run_options.prewarm,
+        account=run_options.credentials[0] if run_options.credentials else os.environ.get("USC_EMAIL"),
+    )
+    profiler = WireProfiler(trace) if run_options.profile_wire else None
+    run = BookingRun(
+        target_time=target_time,
+        target_day=target_day,
+        stop_event=lease.watch(stop_event) if lease is not None else stop_event,
+        trace=trace,
+        options=run_options,
+        on_complete=on_complete,
+        lease=lease,
+    )
+    error = None
+    try:
+        status = _run_booking(run, profiler)
+    except Exception as exc:
+        status = "failed"
+        error = str(exc)
+        print(f"Booking {target_day} at {target_time} failed: {exc}")
+    trace.end()
+    if lease is not None:
+        lease.close()
+        trace.metrics.update(lease.metrics)
+        if lease.lost():
+            # Another agent confirmed first; whatever this run was doing was cut short on purpose
+            status = "yielded"
+            error = None
+            ended_at = trace.metrics.get("ended_at", time.time())
+            booked_elsewhere_at = trace.metrics.pop("booked_elsewhere_at")
+            if booked_elsewhere_at is None:
+                # Booked on another machine whose clock could not be related to ours
+                trace.metrics["abort_ms"] = None
+                print(f"Yielded to {lease.metrics['booked_by']}, abort latency unknown")
+            else:
+                trace.metrics["abort_ms"] = round((ended_at - booked_elsewhere_at) * 1000, 3)
+                print(f"Yielded to {lease.metrics['booked_by']} after {trace.metrics['abort_ms']:.1f} ms")
+    print(f"Timing trace ({status}):\n{trace.format()}")
+    outcome = dict(trace.context)
+    outcome.update(trace.metrics)
+    outcome.update(
+        status=status, error=error, phases=trace.phases, total_ms=trace.total_ms(), started_at=trace.started_at
+    )
+    if profiler is not None:
+        print(profiler.format())
+        summary = profiler.summary()
+        outcome["round_trips"] = {name: phase["round_trips"] for name, phase in summary.items()}
+        try:
+            path = profiler.save(f"{target_day}-{status}")
+        except OSError as exc:
+            print(f"Could not save wire profile: {exc}")
+            path = None
+        trace.publish("wire_profile", summary=summary, redundant=profiler.redundant(), path=path)
+    trace.publish("outcome", **outcome)
+    return outcome
+
+
+def _publish_warmup(trace: PhaseTrace, stage: str) -> None:
+    index = WARMUP_STAGES.index(stage)
+    trace.publish("warmup", stage=stage, progress=(index + 1) / len(WARMUP_STAGES))
+
+
+def _prewarm(session: Any, target_day_button: str, fire_at: Optional[float]) -> None:
+    # Open the target day's view once so its scripts, styles and data requests are cached before the reload
+    session.wait_for(DAY_BUTTON.format(index=0), 10)
+    session.click(target_day_button)
+    deadline = time.time() + PREWARM_TIMEOUT_S
+    count = session.evaluate("performance.getEntriesByType('resource').length")
+    idle_since = time.time()
+    while time.time() < deadline and time.time() - idle_since < PREWARM_IDLE_MS / 1000:
+        time.sleep(0.05)
+        current = session.evaluate("performance.getEntriesByType('resource').length")
+        if current != count:
+            count = current
+            idle_since = time.time()
+    if fire_at is not None:
+        # Keep the pooled connections to the site alive until just before the fire instant
+        quiet_at_ms = int(fire_at * 1000) - KEEPALIVE_QUIET_MS
+        session.execute(KEEPALIVE_SCRIPT % {"quiet_at_ms": quiet_at_ms, "interval_ms": KEEPALIVE_INTERVAL_MS})
+
+
+def _await_book_result(session: Any) -> str:
+    # Polled rather than wait_gone so a refusal is acted on immediately instead of after the full timeout
+    script = BOOK_RESULT_SCRIPT % {"selector": json.dumps(BOOK_BUTTON)}
+    deadline = time.time() + CONFIRM_TIMEOUT_S
+    while True:
+        result = session.evaluate(script)
+        if result != "pending" or time.time() >= deadline:
+            return result
+        time.sleep(CONFIRM_POLL_S)
+
+
+def _record_reload_traffic(session: Any, trace: PhaseTrace) -> None:
+    # Read after the run so it never costs a round trip on the hot path
+    try:
+        traffic = session.evaluate(RELOAD_TRAFFIC_SCRIPT)
+    except Exception as exc:
+        print(f"Could not read reload traffic: {exc}")
+        return
+    if not traffic:
+        return
+    trace.metrics["reload_requests"] = traffic["requests"]
+    trace.metrics["reload_bytes"] = traffic["bytes"]
+    trace.metrics["reload_cached"] = traffic["cached"]
+    trace.metrics["reload_opaque"] = traffic["opaque"]
+    print(
+        f"Fire-time reload: {traffic['requests']} requests, {traffic['bytes']} bytes, "
+        f"{traffic['cached']} from cache, {traffic['opaque']} opaque"
+    )
 
-    # Setup the WebDriver
-    options = webdriver.ChromeOptions()
-    options.headless = False
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-    driver.maximize_window()
 
-    def check_stop() -> bool:
-        if stop_event.is_set():
-            driver.quit()
-            return True
-        return False
+def _run_booking(run: BookingRun, profiler: Optional[WireProfiler]) -> str:
+    email, password = run.options.credentials or get_credentials()
+
+    # Start the browser through the selected engine
+    run.trace.start("launch")
+    session = create_session(run.options.engine, profiler)
+    _publish_warmup(run.trace, "launch")
+    try:
+        return _drive_booking(session, run, email, password)
+    finally:
+        run.trace.metrics["ended_at"] = time.time()
+        if "fired_at" in run.trace.metrics:
+            _record_reload_traffic(session, run.trace)
+        # Close the browser, stop current run
+        session.quit()
+
+
+def _drive_booking(session: Any, run: BookingRun, email: str, password: str) -> str:
+    trace, stop_event, lease, options = run.trace, run.stop_event, run.lease, run.options
+    target_time, target_day = run.target_time, run.target_day
 
     # Timestamp
     print(f"Start login: {datetime.now()}")
 
     # Open the webpage
-    driver.get("https://my.uscsport.nl/pages/login")
+    trace.start("login")
+    session.open(options.login_url)
 
-    if check_stop():
-        return
-    WebDriverWait(driver, 10).until(
-        EC.presence_of_element_located((By.ID, "showEmailLoginButton"))
-    )
+    if stop_event.is_set():
+        return "stopped"
+    session.wait_for("#showEmailLoginButton", 10)
+    session.click("#showEmailLoginButton")
 
-    login_button = driver.find_element(By.ID, "showEmailLoginButton")
-    login_button.click()
-
-    if check_stop():
-        return
-    WebDriverWait(driver, 10).until(
-        EC.presence_of_element_located((By.ID, "email"))
-    )
+    if stop_event.is_set():
+        return "stopped"
+    session.wait_for("#email", 10)
 
     # Log in by filling the fields and clicking login
-    email_field = driver.find_element(By.ID, "email")
-    email_field.send_keys(email)
-    email_field = driver.find_element(By.ID, "password")
-    email_field.send_keys(password)
-    submit_button = driver.find_element(By.ID, "submit")
-    submit_button.click()
+    session.type_text("#email", email)
+    session.type_text("#password", password)
+    session.click("#submit")
 
     # Wait for search category to load
-    if check_stop():
-        return
-    WebDriverWait(driver, 10).until(
-        EC.presence_of_element_located((By.ID, "tag-filterinput"))
-    )
+    _publish_warmup(trace, "login")
+    trace.start("filter")
+    if stop_event.is_set():
+        return "stopped"
+    session.wait_for("#tag-filterinput", 10)
 
     # Locate the search button and then select padel, so that it does not have to do this at execution time
-    search_button = driver.find_element(By.ID, "tag-filterinput")
-    search_button.click()
-    search_button.send_keys("Padel")
+    session.click("#tag-filterinput")
+    session.type_text("#tag-filterinput", "Padel")
 
     # Wait for the padel category to load
-    if check_stop():
-        return
-    WebDriverWait(driver, 10).until(
-        EC.presence_of_element_located((By.ID, "tagCheckbox193"))
-    )
+    if stop_event.is_set():
+        return "stopped"
+    session.wait_for("#tagCheckbox193", 10)
 
     # Select padel
-    padel_button = driver.find_element(By.ID, "tagCheckbox193")
-    padel_button.click()
+    session.click("#tagCheckbox193")
+    _publish_warmup(trace, "filter")
+
+    # Estimate how far the local clock is off from the site's clock
+    trace.start("clock")
+    offset = measure_clock_offset(options.login_url)
+    trace.metrics["clock_offset_ms"] = None if offset is None else round(offset * 1000, 1)
+    trace.publish("clock_offset", offset_ms=trace.metrics["clock_offset_ms"])
+    if lease is not None:
+        lease.clock_offset = offset
+    _publish_warmup(trace, "clock")
 
     # Create variables before booking for speed
     target_day_index = DAY_NAMES.index(target_day)
-    target_day_button = f'[data-test-id="day-button"][data-test-id-day-button-number="{target_day_index}"]'
+    target_day_button = DAY_BUTTON.format(index=target_day_index)
 
     # List guests
     email_list = [
@@ -111,93 +369,123 @@ def fill_form(
         "s.tuininga@hotmail.nl",
     ]
 
-    while True:
-        if check_stop():
-            return
-        # If booking opens
-        if datetime.now().strftime("%H:%M:%S") == target_time:
-            # Refresh
-            driver.refresh()
-
-            # Zoom out to see all bookings
-            driver.execute_script("document.body.style.zoom='80%'")
-
-            # Time log to check speed
-            print(f"Start booking: {datetime.now()}")
-
-            # Wait for correct date to appear and click it
-            if check_stop():
-                return
-            WebDriverWait(driver, 3).until(
-                EC.presence_of_element_located(
-                    (By.CSS_SELECTOR, '[data-test-id="day-button"][data-test-id-day-button-number="0"]')
-                )
-            )
-            driver.find_element(By.CSS_SELECTOR, target_day_button).click()
-
-            # List all reserve buttons and save last one
-            if check_stop():
-                return
-            WebDriverWait(driver, 3).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, '[data-test-id="bookable-slot-book-button"]'))
-            )
-            buttons = driver.find_elements(By.CSS_SELECTOR, '[data-test-id="bookable-slot-book-button"]')
-            last_button = buttons[-1]
-            last_button.click()
-
-            # Scroll pop-up window to the bottom
-            if check_stop():
-                return
-            WebDriverWait(driver, 3).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, '[data-test-id="details-book-button"]'))
-            )
-            modal = driver.find_element(By.CLASS_NAME, "modal-content")
-            driver.execute_script("arguments[0].scrollTop = arguments[0].scrollHeight", modal)
-
-            # Locate the add guests button and click it thrice
-            invite_button = driver.find_element(
-                By.CSS_SELECTOR, '[data-test-id="increase-member-invite-amount-button"]'
-            )
-            for _ in range(3):
-                invite_button.click()
-
-            # List the email fields and populate them
-            emails = driver.find_elements(By.CSS_SELECTOR, '[data-test-id="input-email-member-invites"]')
-            for field, address in zip(emails, email_list):
-                field.send_keys(address)
-
-            # Locate and click the book button
-            book_button = driver.find_element(By.CSS_SELECTOR, '[data-test-id="details-book-button"]')
-            if check_stop():
-                return
-            WebDriverWait(driver, 3).until(EC.element_to_be_clickable(book_button))
-            book_button.click()
-
-            # Time log to check speed
-            print(f"End booking: {datetime.now()}")
-
-            # Nice print for booking
-            today = datetime.today()
-            day_offset = (target_day_index - today.weekday()) % 7 or 7
-            day = today + timedelta(days=day_offset)
-            day_str = day.strftime("%d-%m-%Y")
-            print(f"Booked {target_day} {day_str} at {target_time}")
-
-            # Wait for booking to be finished
-            if check_stop():
-                return
-            time.sleep(10)
-
-            # Close the browser, stop current run
-            driver.quit()
-            if on_complete:
-                on_complete(target_day, target_time)
-            break
-
-        # Refresh often to check if booking opens
-        if check_stop():
-            return
-        time.sleep(0.01)
+    planned_fire_at = None if target_time is None else fire_timestamp(target_time, options.pre_fire_ms)
+    if options.prewarm:
+        trace.start("prewarm")
+        if stop_event.is_set():
+            return "stopped"
+        _prewarm(session, target_day_button, planned_fire_at)
+        _publish_warmup(trace, "prewarm")
+
+    trace.start("armed")
+    _publish_warmup(trace, "armed")
+    fire_at = time.time() if planned_fire_at is None else planned_fire_at
+    # Wait for booking to open, firing pre_fire_ms early to cover the reload's travel time
+    if not wait_until(fire_at, stop_event):
+        return "stopped"
+    trace.metrics["fired_at"] = time.time()
+    trace.metrics["fire_error_ms"] = round((trace.metrics["fired_at"] - fire_at) * 1000, 3)
+    if lease is not None:
+        lease.arm()
+
+    # Refresh
+    trace.start("refresh")
+    session.refresh()
+
+    # Zoom out to see all bookings
+    session.execute("document.body.style.zoom='80%'")
+
+    # Time log to check speed
+    print(f"Start booking: {datetime.now()}")
+
+    # Wait for correct date to appear and click it
+    trace.start("select_day")
+    if stop_event.is_set():
+        return "stopped"
+    session.wait_for(DAY_BUTTON.format(index=0), 3)
+    session.click(target_day_button)
+    if offset is not None and target_time is not None:
+        # When the slot list was requested, by the site's clock, relative to the opening; tells "too early"
+        # apart from "already taken" when no slots show up
+        opens_at = fire_at + options.pre_fire_ms / 1000
+        trace.metrics["site_arrival_ms"] = round((time.time() + offset - opens_at) * 1000, 1)
+
+    # List all reserve buttons and click the last one
+    trace.start("select_slot")
+    if stop_event.is_set():
+        return "stopped"
+    try:
+        session.wait_for(SLOT_BUTTON, 3)
+    except BookingTimeout:
+        # Either the reload reached the site before opening or everything was already taken
+        trace.end()
+        return "no_slots"
+    session.click(SLOT_BUTTON, index=-1)
+
+    # Scroll pop-up window to the bottom
+    trace.start("modal")
+    if stop_event.is_set():
+        return "stopped"
+    session.wait_for(BOOK_BUTTON, 3)
+    session.scroll_to_bottom(".modal-content")
+
+    # Locate the add guests button and click it thrice
+    trace.start("guests")
+    session.click('[data-test-id="increase-member-invite-amount-button"]', times=3)
+
+    # List the email fields and populate them
+    session.fill_all('[data-test-id="input-email-member-invites"]', email_list)
+
+    # Only one agent may press book; the others wait here until it confirms or gives the slot up
+    if lease is not None and not options.rehearsal:
+        trace.start("claim")
+        if not lease.claim():
+            return "stopped"
+
+    # Locate and click the book button
+    trace.start("book")
+    if stop_event.is_set():
+        return "stopped"
+    session.wait_clickable(BOOK_BUTTON, 3)
+    if options.rehearsal:
+        # Stop right before booking so the rehearsal never reserves anything
+        trace.end()
+        print(f"Rehearsal reached the book button: {datetime.now()}")
+        return "rehearsal"
+    session.click(BOOK_BUTTON)
+    trace.end()
+
+    # Time log to check speed
+    print(f"End booking: {datetime.now()}")
+
+    # Wait for booking to be finished; the details modal closes once the site confirms
+    trace.start("confirm")
+    result = _await_book_result(session)
+    trace.metrics["confirmed"] = result == "confirmed"
+    trace.metrics["refused"] = result == "refused"
+    trace.end()
+    if lease is not None:
+        # Released straight away on a refusal, so the next agent waiting in claim() can try its own click
+        if trace.metrics["confirmed"]:
+            lease.confirm()
+        else:
+            lease.release()
+    if not trace.metrics["confirmed"]:
+        # The click went out but the site kept the modal open, so someone else got the slot first
+        reason = "refused by the site" if trace.metrics["refused"] else "not confirmed in time"
+        print(f"Booking {target_day} at {target_time} was {reason}")
+        return "unconfirmed"
+
+    # Nice print for booking
+    today = datetime.today()
+    day_offset = (target_day_index - today.weekday()) % 7 or 7
+    day = today + timedelta(days=day_offset)
+    day_str = day.strftime("%d-%m-%Y")
+    print(f"Booked {target_day} {day_str} at {target_time}")
+
+    if run.on_complete and not stop_event.is_set():
+        run.on_complete(target_day, target_time)
+    return "booked"
 
 
 class BookingScheduler:
@@ -206,47 +494,243 @@ class BookingScheduler:
         self._thread = None
         self._running = False
         self._on_complete = on_complete
+        self._slots: list[Dict[str, Any]] = []
+        self._credentials: Optional[tuple[str, str]] = None
+        self._rehearsal_stop = threading.Event()
+        self._rehearsal_thread: Optional[threading.Thread] = None
+        self._rehearsing = False
+        self._worker: Optional[BookingWorker] = None
+        self._worker_lock = threading.Lock()
+        self.history = BookingHistory()
+        self.events = BookingEvents()
 
     def start(self, email: str, password: str) -> None:
         if self._running:
             return
         if not email or not password:
             raise ValueError("Missing credentials. Provide USC_EMAIL and USC_PASSWORD or enter them in the dialog.")
+        self._credentials = (email, password)
         self._stop_event.clear()
         schedule.clear()
+        self._slots = []
         for slot in load_schedule():
             day = slot.get("day")
             book_time = slot.get("book_time")
-            if day not in DAY_NAMES or not book_time:
-                continue
-            try:
-                book_dt = datetime.strptime(book_time, "%H:%M:%S")
-            except ValueError:
+            if day not in DAY_NAMES or not book_time or parse_time_of_day(book_time) is None:
                 continue
-            check_time = (book_dt - timedelta(minutes=1)).strftime("%H:%M:%S")
-            run_day = DAY_NAMES[(DAY_NAMES.index(day) - 6) % 7].lower()
-            schedule_day = getattr(schedule.every(), run_day)
-            schedule_day.at(check_time).do(
-                lambda target=book_time, target_day=day: fill_form(
-                    target, self._stop_event, target_day, self._on_complete
-                )
-            )
+            self._schedule_slot(slot)
+            self._slots.append(slot)
         self._thread = threading.Thread(target=self._run_loop, daemon=True)
         self._running = True
         self._thread.start()
+        # Spawn the isolated worker now so the first job does not pay for it
+        threading.Thread(target=self._start_worker, args=(load_preferences(),), daemon=True).start()
+        self.events.publish("scheduler", running=True)
+        self._publish_next_fire()
+
+    def rehearse(
+        self,
+        day: str,
+        email: str,
+        password: str,
+        target_time: Optional[str] = None,
+        engine: Optional[str] = None,
+    ) -> None:
+        if day not in DAY_NAMES:
+            raise ValueError(f"Unknown day: {day}")
+        if not email or not password:
+            raise ValueError("Missing credentials. Provide USC_EMAIL and USC_PASSWORD or enter them in the dialog.")
+        if self.is_rehearsing():
+            raise ValueError("A rehearsal is already running.")
+        self._rehearsal_stop.clear()
+        self._rehearsing = True
+        self._rehearsal_thread = threading.Thread(
+            target=self._run_rehearsal,
+            args=(day, (email, password), target_time, engine),
+            daemon=True,
+        )
+        self._rehearsal_thread.start()
+        self.events.publish("rehearsal", running=True)
+
+    def _run_rehearsal(
+        self, day: str, credentials: tuple[str, str], target_time: Optional[str], engine: Optional[str]
+    ) -> None:
+        preferences = load_preferences()
+        try:
+            outcome = fill_form(
+                target_time,
+                self._rehearsal_stop,
+                day,
+                events=self.events,
+                rehearsal=True,
+                credentials=credentials,
+                profile_wire=bool(preferences.get("profile_wire")),
+                engine=engine or preferences.get("engine") or DEFAULT_ENGINE,
+                prewarm=bool(preferences.get("prewarm")),
+            )
+            self.history.record(outcome)
+        finally:
+            # Cleared before the event so listeners already see the rehearsal as over
+            self._rehearsing = False
+            self.events.publish("rehearsal", running=False)
+
+    def is_rehearsing(self) -> bool:
+        return self._rehearsing
+
+    def stop_rehearsal(self) -> None:
+        self._rehearsal_stop.set()
 
     def stop(self) -> None:
+        self.stop_rehearsal()
         if not self._running:
             return
         self._stop_event.set()
         if self._thread is not None:
             self._thread.join(timeout=2)
         schedule.clear()
+        with self._worker_lock:
+            worker, self._worker = self._worker, None
+        if worker is not None:
+            worker.close()
         self._running = False
+        self.events.publish("scheduler", running=False)
 
     def is_running(self) -> bool:
         return self._running
 
+    def _fire_plan(self, slot: Dict[str, Any]) -> Dict[str, Any]:
+        plan = load_fire_plan(self.history, slot["day"], slot["book_time"], load_preferences())
+        # Offsets set explicitly on the slot win over the learned ones
+        if slot.get("pre_fire_ms") is not None:
+            plan["pre_fire_ms"] = slot["pre_fire_ms"]
+            plan["reason"] = f"pre-fire fixed in schedule, {plan['reason']}"
+        if slot.get("warmup_s") is not None:
+            plan["warmup_s"] = slot["warmup_s"]
+            plan["reason"] = f"warm-up fixed in schedule, {plan['reason']}"
+        return plan
+
+    def _schedule_slot(self, slot: Dict[str, Any]) -> None:
+        # Start the warm-up early enough for the measured launch and login time
+        plan = self._fire_plan(slot)
+        book_at = _parse_target(slot["book_time"])
+        run_index = DAY_NAMES.index(run_day_for(slot["day"]))
+        reference = datetime.combine(datetime(2001, 1, 1 + run_index).date(), book_at)
+        check_dt = reference - timedelta(seconds=plan["warmup_s"])
+        schedule_day = getattr(schedule.every(), DAY_NAMES[check_dt.weekday()].lower())
+        # The schedule library works in whole seconds, so round the warm-up start down
+        schedule_day.at(check_dt.strftime("%H:%M:%S")).do(self._run_job, slot)
+
+    def _run_job(self, slot: Dict[str, Any]):
+        target_time = slot["book_time"]
+        target_day = slot["day"]
+        rehearsal = bool(slot.get("rehearsal"))
+        preferences = load_preferences()
+        plan = self._fire_plan(slot)
+        print(f"Fire plan for {target_day} {target_time}: {format_fire_plan(plan)}")
+        self.events.publish("fire_plan", day=target_day, target_time=target_time, **plan)
+        options = {
+            "rehearsal": rehearsal,
+            "credentials": self._credentials,
+            "pre_fire_ms": plan["pre_fire_ms"],
+            "profile_wire": bool(preferences.get("profile_wire")),
+            "engine": slot.get("engine") or preferences.get("engine") or DEFAULT_ENGINE,
+            "prewarm": bool(preferences.get("prewarm")),
+        }
+        lease_spec = None if rehearsal else self._lease_spec(slot, preferences)
+        worker = self._start_worker(preferences)
+        if worker is not None:
+            outcome = self._run_in_worker(worker, target_time, target_day, options, lease_spec)
+        else:
+            outcome = fill_form(
+                target_time,
+                self._stop_event,
+                target_day,
+                None if rehearsal else self._on_complete,
+                self.events,
+                lease=open_lease(lease_spec),
+                **options,
+            )
+        self.history.record(outcome)
+        self._publish_next_fire()
+        if self._stop_event.is_set():
+            return schedule.CancelJob
+        # The booking is over, so waiting for the write here only delays the re-planning below
+        self.history.flush()
+        # Re-schedule so the next warm-up uses the lead time learned from this run
+        self._schedule_slot(slot)
+        return schedule.CancelJob
+
+    def _lease_spec(self, slot: Dict[str, Any], preferences: Dict[str, Any]) -> Optional[Dict[str, str]]:
+        # A plain dict rather than a SlotLease so it can also be handed to the worker process
+        path = preferences.get("lease_path")
+        if not path:
+            return None
+        run_date = datetime.fromtimestamp(fire_timestamp(slot["book_time"])).date().isoformat()
+        return {
+            "path": path,
+            "key": lease_key(slot["day"], slot["book_time"], run_date),
+            "holder": default_holder(self._credentials[0] if self._credentials else None),
+        }
+
+    def _start_worker(self, preferences: Dict[str, Any]) -> Optional[BookingWorker]:
+        # Jobs run in the in-process thread unless the isolated worker is enabled
+        if not preferences.get("isolated_worker"):
+            return None
+        with self._worker_lock:
+            # A start racing stop() must not leave a worker behind that nothing will close
+            if self._stop_event.is_set():
+                return None
+            if self._worker is None:
+                self._worker = BookingWorker(
+                    self.events,
+                    cpus=preferences.get("worker_cpus") or None,
+                    priority=int(preferences.get("worker_priority") or 0),
+                )
+            worker = self._worker
+        try:
+            worker.start()
+        except (OSError, RuntimeError) as exc:
+            print(f"Booking worker unavailable, running in-process: {exc}")
+            return None
+        return worker
+
+    def _run_in_worker(
+        self,
+        worker: BookingWorker,
+        target_time: str,
+        target_day: str,
+        options: Dict[str, Any],
+        lease_spec: Optional[Dict[str, str]],
+    ) -> Dict[str, Any]:
+        try:
+            outcome = worker.run(target_time, self._stop_event, target_day, lease=lease_spec, **options)
+        except (OSError, EOFError, RuntimeError) as exc:
+            print(f"Booking worker failed: {exc}")
+            with self._worker_lock:
+                if self._worker is worker:
+                    self._worker = None
+            worker.close()
+            return {"day": target_day, "target_time": target_time, "status": "failed", "error": str(exc), "phases": []}
+        # Callbacks cannot cross the process boundary, so the completion hook runs here, on the same terms as
+        # the in-thread path: a confirmed booking of a run that was not stopped
+        if (
+            self._on_complete is not None
+            and not options["rehearsal"]
+            and not self._stop_event.is_set()
+            and outcome["status"] == "booked"
+            and outcome.get("confirmed")
+        ):
+            self._on_complete(target_day, target_time)
+        return outcome
+
+    def _publish_next_fire(self) -> None:
+        if not self._slots:
+            self.events.publish("next_fire", fire_at=None)
+            return
+        slot = min(self._slots, key=lambda item: next_fire_time(item["day"], item["book_time"]))
+        fire_at = next_fire_time(slot["day"], slot["book_time"])
+        self.events.publish("next_fire", day=slot["day"], target_time=slot["book_time"], fire_at=fire_at.timestamp())
+
     def _run_loop(self) -> None:
         while not self._stop_event.is_set():
             schedule.run_pending()
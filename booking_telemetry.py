@@ -0,0 +1,133 @@
+import queue
+import threading
+import time
+import urllib.request
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, List, Optional
+
+EventCallback = Callable[[Dict[str, Any]], None]
+
+
+class BookingEvents:
+    def __init__(self) -> None:
+        self._subscribers: List[EventCallback] = []
+        self._lock = threading.Lock()
+        self._queue: "queue.SimpleQueue[Dict[str, Any]]" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, callback: EventCallback) -> None:
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: EventCallback) -> None:
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def publish(self, kind: str, **data: Any) -> None:
+        # Only enqueues; subscribers run on the dispatcher thread so the booking thread never waits on them
+        event = {"kind": kind, "timestamp": time.time()}
+        event.update(data)
+        self._queue.put(event)
+        self._ensure_dispatcher()
+
+    def _ensure_dispatcher(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._dispatch_loop, daemon=True)
+                self._thread.start()
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            event = self._queue.get()
+            with self._lock:
+                subscribers = list(self._subscribers)
+            for callback in subscribers:
+                try:
+                    callback(event)
+                except Exception as exc:
+                    print(f"Telemetry subscriber failed: {exc}")
+
+
+class PhaseTrace:
+    def __init__(self, events: Optional[BookingEvents] = None, **context: Any) -> None:
+        self.events = events
+        self.context = context
+        self.phases: List[Dict[str, Any]] = []
+        self.metrics: Dict[str, Any] = {}
+        self.started_at = time.time()
+        self._origin = time.perf_counter()
+        self._current: Optional[str] = None
+        self._current_start = 0.0
+
+    @property
+    def current(self) -> Optional[str]:
+        return self._current
+
+    def start(self, name: str) -> None:
+        self.end()
+        self._current = name
+        self._current_start = time.perf_counter()
+
+    def end(self) -> None:
+        if self._current is None:
+            return
+        now = time.perf_counter()
+        phase = {
+            "name": self._current,
+            "offset_ms": round((self._current_start - self._origin) * 1000, 3),
+            "duration_ms": round((now - self._current_start) * 1000, 3),
+        }
+        self.phases.append(phase)
+        self._current = None
+        self.publish("phase", **phase)
+
+    def total_ms(self) -> float:
+        return round((time.perf_counter() - self._origin) * 1000, 3)
+
+    def publish(self, kind: str, **data: Any) -> None:
+        if self.events is None:
+            return
+        payload = dict(self.context)
+        payload.update(data)
+        self.events.publish(kind, **payload)
+
+    def format(self) -> str:
+        lines = [f"  {phase['name']:<16} {phase['duration_ms']:>10.1f} ms" for phase in self.phases]
+        return "\n".join(lines)
+
+
+def measure_clock_offset(url: str, timeout: float = 2.5) -> Optional[float]:
+    # HTTP Date headers only have second resolution, so wait for the header to tick over
+    # and take the midpoint of the two requests around the tick as the server's whole second.
+    deadline = time.time() + timeout
+    previous: Optional[tuple[float, float]] = None
+    while time.time() < deadline:
+        request = urllib.request.Request(url, method="HEAD")
+        sent = time.time()
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                header = response.headers.get("Date")
+        except OSError:
+            return None
+        received = time.time()
+        if not header:
+            return None
+        try:
+            server_second = parsedate_to_datetime(header).timestamp()
+        except (ValueError, TypeError):
+            # A malformed Date header gives no usable clock, same as a missing one
+            return None
+        midpoint = (sent + received) / 2
+        if previous is not None and server_second > previous[0]:
+            tick_local = (previous[1] + midpoint) / 2
+            return server_second - tick_local
+        previous = (server_second, midpoint)
+        time.sleep(0.05)
+    if previous is None:
+        return None
+    # No tick observed: fall back to assuming the server was halfway through its second
+    return previous[0] + 0.5 - previous[1]
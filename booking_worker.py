@@ -0,0 +1,211 @@
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# The worker owns the fire instant: its own interpreter, so no GIL sharing with the Qt event loop
+WORKER_START_TIMEOUT_S = 30
+# Time a stopped worker gets to finish its job and close the browser before it is terminated
+WORKER_CLOSE_GRACE_S = 15
+POLL_INTERVAL_S = 0.05
+
+
+def apply_isolation(cpus: Optional[List[int]], priority: int) -> Dict[str, Any]:
+    # Best effort: report what was applied instead of failing when the OS or permissions say no
+    applied: Dict[str, Any] = {"pid": os.getpid(), "cpus": None, "priority": None}
+    if cpus:
+        if hasattr(os, "sched_setaffinity"):
+            try:
+                os.sched_setaffinity(0, set(cpus))
+                applied["cpus"] = sorted(os.sched_getaffinity(0))
+            except OSError as exc:
+                applied["cpus_error"] = str(exc)
+        else:
+            applied["cpus_error"] = "CPU affinity is not supported on this platform"
+    if priority:
+        if sys.platform == "win32":
+            import ctypes
+
+            # ABOVE_NORMAL_PRIORITY_CLASS, or HIGH_PRIORITY_CLASS for a raise of 10 or more
+            priority_class = 0x00000080 if priority >= 10 else 0x00008000
+            kernel32 = ctypes.windll.kernel32
+            if kernel32.SetPriorityClass(kernel32.GetCurrentProcess(), priority_class):
+                applied["priority"] = priority
+            else:
+                applied["priority_error"] = "SetPriorityClass was refused"
+        else:
+            try:
+                # A positive priority raises the process, i.e. a lower nice value
+                os.setpriority(os.PRIO_PROCESS, 0, -priority)
+                applied["priority"] = priority
+            except OSError as exc:
+                applied["priority_error"] = str(exc)
+    return applied
+
+
+def _worker_main(
+    connection: Any, event_queue: Any, stop_event: Any, cpus: Optional[List[int]], priority: int
+) -> None:
+    applied = apply_isolation(cpus, priority)
+    # Import the booking flow (Selenium and friends) now, long before the fire instant
+    from booking_lease import open_lease
+    from booking_scheduler import fill_form, wait_until
+    from booking_telemetry import BookingEvents
+
+    events = BookingEvents()
+    events.subscribe(event_queue.put)
+    connection.send(applied)
+
+    local_stop = threading.Event()
+
+    def mirror_stop() -> None:
+        # fill_form only knows threading events, so mirror the cross-process one
+        while True:
+            stop_event.wait()
+            local_stop.set()
+            while stop_event.is_set():
+                time.sleep(POLL_INTERVAL_S)
+            local_stop.clear()
+
+    threading.Thread(target=mirror_stop, daemon=True).start()
+
+    while True:
+        job = connection.recv()
+        if job is None:
+            return
+        if job["kind"] == "probe":
+            fired = wait_until(job["fire_at"], local_stop)
+            fired_at = time.time()
+            connection.send({"fired": fired, "fire_error_ms": (fired_at - job["fire_at"]) * 1000})
+            continue
+        options = dict(job["options"])
+        options["lease"] = open_lease(options.get("lease"))
+        outcome = fill_form(job["target_time"], local_stop, job["target_day"], events=events, **options)
+        connection.send(outcome)
+
+
+class BookingWorker:
+    def __init__(self, events: Any = None, cpus: Optional[List[int]] = None, priority: int = 0) -> None:
+        self.events = events
+        self.cpus = cpus
+        self.priority = priority
+        self.info: Dict[str, Any] = {}
+        self._context = multiprocessing.get_context("spawn")
+        self._process: Optional[multiprocessing.process.BaseProcess] = None
+        self._connection: Any = None
+        self._event_queue: Any = None
+        self._stop: Any = None
+        self._closed = False
+        # Serializes jobs and spawning; close() deliberately never takes it
+        self._lock = threading.RLock()
+
+    def start(self) -> None:
+        # Spawning and importing the booking flow takes a while, so do it well before the job runs
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Booking worker is closed")
+            if not self.is_alive():
+                self._spawn()
+
+    def _spawn(self) -> None:
+        parent_connection, child_connection = self._context.Pipe()
+        event_queue = self._context.Queue()
+        # A fresh stop event per process, so a worker still winding down is never un-stopped
+        stop = self._context.Event()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(child_connection, event_queue, stop, self.cpus, self.priority),
+            daemon=True,
+        )
+        process.start()
+        child_connection.close()
+        threading.Thread(target=self._relay_events, args=(event_queue,), daemon=True).start()
+        try:
+            if not parent_connection.poll(WORKER_START_TIMEOUT_S):
+                raise RuntimeError("Booking worker did not start in time")
+            info = parent_connection.recv()
+        except (EOFError, OSError, RuntimeError) as exc:
+            stop.set()
+            self._reap(process, parent_connection, event_queue)
+            raise RuntimeError(f"Booking worker failed to start: {exc}") from exc
+        if self._closed:
+            # close() ran while this worker was starting; do not leave it behind
+            stop.set()
+            self._reap(process, parent_connection, event_queue)
+            raise RuntimeError("Booking worker is closed")
+        self._process, self._connection, self._event_queue, self._stop = process, parent_connection, event_queue, stop
+        self.info = info
+        print(f"Booking worker ready: {self.info}")
+        if self.events is not None:
+            self.events.publish("worker", **self.info)
+
+    def _relay_events(self, event_queue: Any) -> None:
+        while True:
+            try:
+                event = event_queue.get()
+            except (EOFError, OSError):
+                return
+            if event is None:
+                return
+            if self.events is not None:
+                kind = event.pop("kind")
+                self.events.publish(kind, **event)
+
+    def is_alive(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    def _call(self, job: Dict[str, Any], stop_event: threading.Event) -> Any:
+        with self._lock:
+            self.start()
+            process, connection, stop = self._process, self._connection, self._stop
+            if process is None:
+                raise RuntimeError("Booking worker is closed")
+            connection.send(job)
+            while not connection.poll(POLL_INTERVAL_S):
+                if not process.is_alive():
+                    raise RuntimeError("Booking worker exited during the job")
+                if stop_event.is_set() and not stop.is_set():
+                    stop.set()
+            result = connection.recv()
+            if not self._closed:
+                stop.clear()
+            return result
+
+    def run(
+        self, target_time: Optional[str], stop_event: threading.Event, target_day: str, **options: Any
+    ) -> Dict[str, Any]:
+        # Same arguments as fill_form, except callbacks and events stay here and the lease is passed as a spec
+        return self._call(
+            {"kind": "book", "target_time": target_time, "target_day": target_day, "options": options}, stop_event
+        )
+
+    def probe(self, fire_at: float, stop_event: Optional[threading.Event] = None) -> Dict[str, Any]:
+        # Fire at a timestamp without a browser; measures how precisely the worker hits the instant
+        return self._call({"kind": "probe", "fire_at": fire_at}, stop_event or threading.Event())
+
+    def close(self) -> None:
+        # Returns at once: the running job sees the stop, and a reaper gives it time to quit its browser
+        self._closed = True
+        process, connection, event_queue, stop = self._process, self._connection, self._event_queue, self._stop
+        self._process = None
+        if process is None:
+            return
+        stop.set()
+        threading.Thread(target=self._reap, args=(process, connection, event_queue), daemon=True).start()
+
+    @staticmethod
+    def _reap(process: Any, connection: Any, event_queue: Any) -> None:
+        try:
+            connection.send(None)
+        except (OSError, ValueError):
+            pass
+        process.join(WORKER_CLOSE_GRACE_S)
+        if process.is_alive():
+            process.terminate()
+            process.join(2)
+        try:
+            event_queue.put(None)
+        except (OSError, ValueError):
+            pass
@@ -0,0 +1,390 @@
+import argparse
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+# A local stand-in for the booking site with the same ids and data-test-ids the booking flow uses.
+# Login and the sport filter are kept in sessionStorage so they survive the fire-time reload.
+PAGE_HTML = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>USC mock</title>
+<link rel="stylesheet" href="/static/app.css">
+<script src="/static/app.js" defer></script>
+</head>
+<body>
+<div id="login">
+  <button id="showEmailLoginButton">Log in with email</button>
+  <form id="emailForm" hidden>
+    <input id="email" type="email">
+    <input id="password" type="password">
+    <button id="submit" type="button">Log in</button>
+  </form>
+</div>
+<div id="search" hidden>
+  <input id="tag-filterinput">
+  <label hidden id="tagOption"><input id="tagCheckbox193" type="checkbox"> Padel</label>
+</div>
+<div id="days"></div>
+<div id="slots"></div>
+<div id="modal"></div>
+</body>
+</html>
+"""
+APP_JS = """
+const state = sessionStorage;
+const show = (id, visible) => { document.getElementById(id).hidden = !visible; };
+
+function render() {
+    const loggedIn = state.getItem("loggedIn") === "1";
+    show("login", !loggedIn);
+    show("search", loggedIn);
+    const days = document.getElementById("days");
+    days.innerHTML = "";
+    if (!loggedIn || state.getItem("padel") !== "1") { return; }
+    for (let index = 0; index < 7; index++) {
+        const button = document.createElement("button");
+        button.dataset.testId = "day-button";
+        button.setAttribute("data-test-id-day-button-number", String(index));
+        button.textContent = "Day " + index;
+        button.addEventListener("click", () => loadSlots(index));
+        days.appendChild(button);
+    }
+}
+
+let dayView = null;
+
+function loadDayView() {
+    // Like a lazily loaded chunk: the day view's script and style only download on the first day click
+    if (!dayView) {
+        dayView = new Promise((resolve) => {
+            const style = document.createElement("link");
+            style.rel = "stylesheet";
+            style.href = "/static/day.css";
+            document.head.appendChild(style);
+            const script = document.createElement("script");
+            script.src = "/static/day.js";
+            script.onload = resolve;
+            script.onerror = resolve;
+            document.head.appendChild(script);
+        });
+    }
+    return dayView;
+}
+
+async function loadSlots(day) {
+    await loadDayView();
+    const response = await fetch("/api/slots?day=" + day, {cache: "no-store"});
+    const slots = await response.json();
+    const container = document.getElementById("slots");
+    container.innerHTML = "";
+    for (const slot of slots) {
+        const button = document.createElement("button");
+        button.dataset.testId = "bookable-slot-book-button";
+        button.textContent = slot.label;
+        button.addEventListener("click", () => openDetails(slot));
+        container.appendChild(button);
+    }
+}
+
+function openDetails(slot) {
+    const modal = document.getElementById("modal");
+    modal.innerHTML = "";
+    const content = document.createElement("div");
+    content.className = "modal-content";
+    const invites = document.createElement("div");
+    const more = document.createElement("button");
+    more.dataset.testId = "increase-member-invite-amount-button";
+    more.textContent = "+";
+    more.addEventListener("click", () => {
+        const field = document.createElement("input");
+        field.dataset.testId = "input-email-member-invites";
+        invites.appendChild(field);
+    });
+    const book = document.createElement("button");
+    book.dataset.testId = "details-book-button";
+    book.textContent = "Book";
+    book.addEventListener("click", async () => {
+        book.disabled = true;
+        const guests = Array.from(invites.querySelectorAll("input")).map((field) => field.value);
+        const response = await fetch("/api/book", {
+            method: "POST",
+            headers: {"Content-Type": "application/json"},
+            body: JSON.stringify({slot: slot.id, account: state.getItem("account"), guests: guests}),
+        });
+        if (response.ok) {
+            modal.innerHTML = "";
+        } else {
+            book.textContent = "Taken";
+        }
+    });
+    content.append(more, invites, book);
+    modal.appendChild(content);
+}
+
+document.getElementById("showEmailLoginButton").addEventListener("click", () => show("emailForm", true));
+document.getElementById("submit").addEventListener("click", () => {
+    state.setItem("loggedIn", "1");
+    state.setItem("account", document.getElementById("email").value);
+    render();
+});
+document.getElementById("tag-filterinput").addEventListener("input", () => show("tagOption", true));
+document.getElementById("tagCheckbox193").addEventListener("change", () => {
+    state.setItem("padel", "1");
+    render();
+});
+render();
+"""
+APP_CSS = """
+body { font-family: sans-serif; }
+.modal-content { max-height: 200px; overflow-y: auto; border: 1px solid #111827; padding: 8px; }
+.modal-content > * { display: block; margin: 24px 0; }
+"""
+# Padded to a realistic chunk size so cold and warm reloads differ visibly in bytes
+DAY_JS = "window.dayViewLoaded = true;\n" + "// day view chunk\n" * 4000
+DAY_CSS = "[data-test-id='bookable-slot-book-button'] { margin: 4px; }\n" + "/* day view styles */\n" * 1000
+STATIC_FILES = {
+    "/static/app.js": ("application/javascript", APP_JS.encode("utf-8")),
+    "/static/app.css": ("text/css", APP_CSS.encode("utf-8")),
+    "/static/day.js": ("application/javascript", DAY_JS.encode("utf-8")),
+    "/static/day.css": ("text/css", DAY_CSS.encode("utf-8")),
+}
+DEFAULT_SLOT_COUNT = 4
+DEFAULT_LATENCY = "lognormal:150,0.5"
+COMPETITOR_RETRY_MS = 20
+COMPETITOR_PATIENCE_S = 5.0
+
+
+class MockServer(ThreadingHTTPServer):
+    # A burst of competing clients at the opening second must not hit a full listen backlog
+    request_queue_size = 256
+    daemon_threads = True
+
+
+def latency_sampler(spec: str) -> Callable[[], float]:
+    # fixed:MS, uniform:LOW,HIGH, normal:MEAN,SD or lognormal:MEDIAN,SIGMA, all in milliseconds
+    kind, _, raw = spec.partition(":")
+    try:
+        values = [float(value) for value in raw.split(",")] if raw else []
+    except ValueError as exc:
+        raise ValueError(f"Invalid latency distribution: {spec}") from exc
+    if kind == "fixed" and len(values) == 1:
+        return lambda: values[0]
+    if kind == "uniform" and len(values) == 2:
+        return lambda: random.uniform(values[0], values[1])
+    if kind == "normal" and len(values) == 2:
+        return lambda: max(0.0, random.gauss(values[0], values[1]))
+    if kind == "lognormal" and len(values) == 2:
+        return lambda: values[0] * math.exp(random.gauss(0.0, values[1]))
+    raise ValueError(f"Invalid latency distribution: {spec}")
+
+
+class MockSite:
+    def __init__(self, port: int = 0, slot_count: int = DEFAULT_SLOT_COUNT, opens_at: float = 0.0) -> None:
+        # Slots stay hidden until opens_at and each one can be booked once
+        self.slot_count = slot_count
+        self.opens_at = opens_at
+        self.bookings: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self.server = MockServer(("127.0.0.1", port), self._handler())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def login_url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_port}/pages/login"
+
+    def reset(self, slot_count: Optional[int] = None, opens_at: Optional[float] = None) -> None:
+        with self._lock:
+            self.bookings = []
+            if slot_count is not None:
+                self.slot_count = slot_count
+            if opens_at is not None:
+                self.opens_at = opens_at
+
+    def open_slots(self) -> List[Dict[str, Any]]:
+        if time.time() < self.opens_at:
+            return []
+        with self._lock:
+            taken = {booking["slot"] for booking in self.bookings}
+            return [
+                {"id": index, "label": f"Court {index + 1}"}
+                for index in range(self.slot_count)
+                if index not in taken
+            ]
+
+    def book(self, slot: Any, account: Optional[str]) -> bool:
+        if time.time() < self.opens_at:
+            return False
+        with self._lock:
+            if not isinstance(slot, int) or not 0 <= slot < self.slot_count:
+                return False
+            if any(booking["slot"] == slot for booking in self.bookings):
+                return False
+            self.bookings.append({"slot": slot, "account": account, "booked_at": time.time()})
+            return True
+
+    def bookings_for(self, account: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [booking for booking in self.bookings if booking["account"] == account]
+
+    def start(self) -> "MockSite":
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _handler(self) -> type:
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def _send(
+                self, status: int, content_type: str, body: bytes, headers: Optional[Dict[str, str]] = None
+            ) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(body)
+
+            def _json(self, status: int, payload: Any) -> None:
+                body = json.dumps(payload).encode("utf-8")
+                self._send(status, "application/json", body, {"Cache-Control": "no-store"})
+
+            def do_HEAD(self) -> None:
+                # The clock check only needs the Date header
+                self.do_GET()
+
+            def do_GET(self) -> None:
+                parsed = urlparse(self.path)
+                if parsed.path == "/pages/login":
+                    body = PAGE_HTML.encode("utf-8")
+                    self._send(200, "text/html; charset=utf-8", body, {"Cache-Control": "no-cache"})
+                elif parsed.path in STATIC_FILES:
+                    content_type, body = STATIC_FILES[parsed.path]
+                    etag = f'"{hashlib.sha1(body).hexdigest()[:16]}"'
+                    if self.headers.get("If-None-Match") == etag:
+                        self._send(304, content_type, b"", {"ETag": etag})
+                        return
+                    self._send(200, content_type, body, {"ETag": etag, "Cache-Control": "max-age=3600"})
+                elif parsed.path == "/api/slots":
+                    day = parse_qs(parsed.query).get("day", ["0"])[0]
+                    self._json(200, site.open_slots() if day.isdigit() else [])
+                else:
+                    self._send(404, "text/plain", b"Not found")
+
+            def do_POST(self) -> None:
+                if urlparse(self.path).path != "/api/book":
+                    self._send(404, "text/plain", b"Not found")
+                    return
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    request = json.loads(self.rfile.read(length) or b"{}")
+                except json.JSONDecodeError:
+                    self._json(400, {"error": "invalid json"})
+                    return
+                if site.book(request.get("slot"), request.get("account")):
+                    self._json(200, {"booked": request.get("slot")})
+                else:
+                    self._json(409, {"error": "slot taken or not open"})
+
+        return Handler
+
+
+class CompetingClients:
+    def __init__(self, site: MockSite, count: int, latency: Callable[[], float], prefix: str = "bot") -> None:
+        # Synthetic bookers that skip the browser and hit the booking API directly once the slots open
+        self.site = site
+        self.count = count
+        self.latency = latency
+        self.prefix = prefix
+        self._base_url = site.login_url.rsplit("/pages/", 1)[0]
+        self._threads: List[threading.Thread] = []
+
+    def start(self, opens_at: float) -> "CompetingClients":
+        self._threads = [
+            threading.Thread(target=self._compete, args=(f"{self.prefix}-{index}", opens_at), daemon=True)
+            for index in range(self.count)
+        ]
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def join(self, timeout: float = COMPETITOR_PATIENCE_S + 5) -> None:
+        deadline = time.time() + timeout
+        for thread in self._threads:
+            thread.join(max(0.0, deadline - time.time()))
+
+    def _request(self, path: str, payload: Optional[Dict[str, Any]] = None) -> Any:
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        request = urllib.request.Request(
+            f"{self._base_url}{path}", data=data, headers={"Content-Type": "application/json"}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=5) as response:
+                return json.load(response)
+        except (urllib.error.URLError, OSError, ValueError):
+            return None
+
+    def _compete(self, name: str, opens_at: float) -> None:
+        # Each client first shows up after its own sampled reaction time, then retries until it books or gives up
+        start_at = opens_at + self.latency() / 1000
+        while time.time() < start_at:
+            time.sleep(min(0.005, max(0.0, start_at - time.time())))
+        deadline = opens_at + COMPETITOR_PATIENCE_S
+        while time.time() < deadline:
+            slots = self._request("/api/slots?day=0")
+            if slots:
+                choice = random.choice(slots)
+                if self._request("/api/book", {"slot": choice["id"], "account": name}):
+                    return
+            elif slots is not None and time.time() >= opens_at:
+                # Open but empty: everything is taken
+                return
+            time.sleep(COMPETITOR_RETRY_MS / 1000)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve a local mock of the booking site.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--slots", type=int, default=DEFAULT_SLOT_COUNT, help="Number of bookable slots.")
+    parser.add_argument("--opens-in", type=float, default=0.0, help="Seconds until the slots open.")
+    parser.add_argument("--competitors", type=int, default=0, help="Synthetic bookers racing at the opening.")
+    parser.add_argument(
+        "--latency", default=DEFAULT_LATENCY, help="Competitor reaction time, e.g. lognormal:150,0.5 (ms)."
+    )
+    args = parser.parse_args()
+    opens_at = time.time() + args.opens_in
+    site = MockSite(args.port, args.slots, opens_at).start()
+    print(f"Mock booking site at {site.login_url}")
+    if args.competitors:
+        CompetingClients(site, args.competitors, latency_sampler(args.latency)).start(opens_at)
+        print(f"{args.competitors} competitors race when the slots open at {time.ctime(opens_at)}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        site.stop()
+
+
+if __name__ == "__main__":
+    main()
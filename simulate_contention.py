@@ -0,0 +1,88 @@
+import argparse
+import statistics
+import threading
+import time
+from datetime import datetime
+
+from booking_adaptive import percentile
+from booking_config import ENGINE_NAMES, format_time_of_day
+from booking_scheduler import fill_form
+from mock_site import DEFAULT_LATENCY, CompetingClients, MockSite, latency_sampler
+
+SIM_CREDENTIALS = ("sim@example.com", "sim")
+
+
+def run_trial(site: MockSite, engine: str, pre_fire_ms: float, competitors: int, latency, lead_s: float) -> dict:
+    # Open the slots far enough ahead that the engine finishes its warm-up before the opening instant
+    opens_at = time.time() + lead_s
+    site.reset(opens_at=opens_at)
+    target_time = format_time_of_day(datetime.fromtimestamp(opens_at).time())
+    clients = CompetingClients(site, competitors, latency).start(opens_at)
+    outcome = fill_form(
+        target_time,
+        threading.Event(),
+        "Monday",
+        credentials=SIM_CREDENTIALS,
+        pre_fire_ms=pre_fire_ms,
+        engine=engine,
+        login_url=site.login_url,
+    )
+    clients.join()
+    ours = site.bookings_for(SIM_CREDENTIALS[0])
+    others = [booking for booking in site.bookings if booking["account"] != SIM_CREDENTIALS[0]]
+    return {
+        "status": outcome["status"],
+        "won": bool(ours),
+        "time_to_book_ms": (ours[0]["booked_at"] - opens_at) * 1000 if ours else None,
+        "competitor_ms": [(booking["booked_at"] - opens_at) * 1000 for booking in others],
+    }
+
+
+def format_ms(values: list[float]) -> str:
+    if not values:
+        return "-"
+    ordered = sorted(values)
+    p95 = percentile(ordered, 0.95)
+    return f"p50 {statistics.median(ordered):.0f} ms / p95 {p95:.0f} ms"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Race our booking engines against synthetic bookers on the mock site.")
+    parser.add_argument("--engine", choices=ENGINE_NAMES, action="append", help="Only simulate these engines.")
+    parser.add_argument("--offsets", default="0,50,150", help="Comma separated pre-fire offsets in ms.")
+    parser.add_argument("--trials", type=int, default=5, help="Trials per engine and offset.")
+    parser.add_argument("--competitors", type=int, default=20)
+    parser.add_argument("--latency", default=DEFAULT_LATENCY, help="Competitor reaction time distribution (ms).")
+    parser.add_argument("--slots", type=int, default=4, help="Bookable slots per opening.")
+    parser.add_argument("--lead", type=float, default=20.0, help="Seconds of warm-up before each opening.")
+    args = parser.parse_args()
+
+    latency = latency_sampler(args.latency)
+    offsets = [float(value) for value in args.offsets.split(",") if value.strip()]
+    site = MockSite(slot_count=args.slots).start()
+    rows = []
+    try:
+        for engine in args.engine or ENGINE_NAMES:
+            for pre_fire_ms in offsets:
+                trials = [
+                    run_trial(site, engine, pre_fire_ms, args.competitors, latency, args.lead)
+                    for _ in range(args.trials)
+                ]
+                rows.append((engine, pre_fire_ms, trials))
+    finally:
+        site.stop()
+
+    print(f"{args.competitors} competitors ({args.latency}) for {args.slots} slots, {args.trials} trials each")
+    for engine, pre_fire_ms, trials in rows:
+        wins = sum(1 for trial in trials if trial["won"])
+        ours = [trial["time_to_book_ms"] for trial in trials if trial["won"]]
+        competitors = [value for trial in trials for value in trial["competitor_ms"]]
+        statuses = ", ".join(sorted({trial["status"] for trial in trials}))
+        print(
+            f"{engine:<9} offset {pre_fire_ms:>5.0f} ms  won {wins}/{len(trials)} ({wins / len(trials):.0%})  "
+            f"ours {format_ms(ours)}  competitors {format_ms(competitors)}  [{statuses}]"
+        )
+
+
+if __name__ == "__main__":
+    main()